@@ -0,0 +1,64 @@
+import json
+import random
+import sys
+import time
+import pandas as pd
+
+sys.path.insert(0, '.')
+
+from checkpy import RestCheckpy
+from checkpy.restcheck import TimeSeriesType
+
+TICK_FIELDS = ['F20044_02', 'F20004_02', 'F16013', 'F15001', 'F15009', 'F15010', 'F15011', 'F15006', 'F15472', 'F15004', 'F15020', 'F15015', 'F15023', 'F14501', 'F14531']
+
+
+def generate_tick_resp(n):
+    results = []
+
+    for i in range(n):
+        second = i // 10
+        row = {key: random.randint(1, 100000) for key in TICK_FIELDS}
+        row.update({'F20044_02': 20240102, 'F20004_02': (9 + second // 3600) * 1000000 + (second // 60 % 60) * 10000 + second % 60 * 100 + i % 10, 'F16013': '005930'})
+        results.append(row)
+
+    return {'success': True, 'results': results}
+
+
+def legacy_parse(resp, translate):
+    df = pd.DataFrame(resp.get('results'))
+    df.columns = [translate.get(column) for column in df.columns]
+    df['TIME'] = pd.to_datetime(df['INTRA_DATE'].astype(str) + df['INTRA_TIME'].astype(str).str.zfill(8), format='%Y%m%d%H%M%S%f')
+    df.set_index(df['TIME'], inplace=True, drop=True)
+    df.sort_index(inplace=True)
+    df.drop(columns=['TIME', 'INTRA_DATE', 'INTRA_TIME'], errors='ignore', inplace=True)
+
+    return df.loc[:, df.columns.notna()].astype('float', errors='ignore')
+
+
+def bench(label, func, repeat=3):
+    elapsed = min(timeit_once(func) for _ in range(repeat))
+    print(f'{label:<24} {elapsed * 1e3:10.1f} ms')
+
+
+def timeit_once(func):
+    start = time.perf_counter()
+    func()
+
+    return time.perf_counter() - start
+
+
+def main(n=200000):
+    with open('checkpy/translate.json') as f:
+        translate = json.load(f)
+
+    resp = generate_tick_resp(n)
+    client = RestCheckpy('bench', 'bench')
+
+    print(f'{n} synthetic tick rows, {len(TICK_FIELDS)} fields')
+    bench('legacy DataFrame path', lambda: legacy_parse(resp, translate))
+    bench('schema decode path', lambda: client._parse_resp(resp, is_time_series=TimeSeriesType.INTRA_DAY))
+    client.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import json
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from checkpy import IntradayPoller, RestCheckpy
+
+ROWS = 60000
+POLL_ROWS = 50
+CHECKPOINTS = [0.1, 0.25, 0.5, 0.75, 1.0]
+REPEATS = 5
+
+
+def generate_rows(n):
+    rows, tr_time = [], 9000000
+
+    for i in range(n):
+        tr_time += random.choice([0, 0, 1, 100])
+        rows.append({'F20004_01': str(tr_time), 'F20008_01': str(random.randint(30000, 31000)), 'F20009_01': str(random.randint(1, 500)), 'F20012_01': str(i * 10), 'F20019_01': str(random.randint(-500, 500)), 'F20041_01': f'{random.uniform(-2, 2):.2f}', 'F20046_01': str(random.randint(1, 5)), 'F20105_01': str(random.randint(30000, 31000)), 'F20125_01': str(random.randint(30000, 31000))})
+
+    return rows
+
+
+class SessionClient(RestCheckpy):
+    # Serves the session so far, already parsed from JSON, so the timings below cover decoding only. Loading the body is the
+    # same whole-day cost for both approaches and is measured on its own.
+    def __init__(self):
+        super().__init__('user', 'key')
+        self.response = None
+
+    def _post(self, end_point, payload):
+        return self.response
+
+
+def bench(rows):
+    client = SessionClient()
+    poller = IntradayPoller(client, 'get_kospi_index_tick_info')
+
+    # Each repeat brings a fresh poller to just before the checkpoint untimed, then times one poll that picks up POLL_ROWS new
+    # rows. The best of REPEATS runs is kept for every measure.
+    for checkpoint in CHECKPOINTS:
+        end = int(len(rows) * checkpoint)
+        full, incremental, body = [], [], []
+
+        for _ in range(REPEATS):
+            poller.reset()
+            client.response = {'success': True, 'results': rows[:end - POLL_ROWS]}
+            poller.poll('001')
+            client.response = {'success': True, 'results': rows[:end]}
+            body_bytes = json.dumps(client.response).encode()
+
+            start = time.perf_counter()
+            client.get_kospi_index_tick_info('001')
+            full.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            new_rows = poller.poll('001')
+            incremental.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            json.loads(body_bytes)
+            body.append(time.perf_counter() - start)
+
+        full, incremental, body = min(full), min(incremental), min(body)
+
+        print(f'{end:>7,} rows  decode full refetch {full * 1000:8.2f}ms  incremental {incremental * 1000:6.2f}ms ({len(new_rows)} new)  json body (both) {body * 1000:8.2f}ms')
+
+    client.close()
+
+
+def main():
+    bench(generate_rows(ROWS))
+
+
+if __name__ == '__main__':
+    main()
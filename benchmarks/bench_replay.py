@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, '.')
+
+from bench_stream_decode import generate_frames
+from checkpy import ReplaySource, StreamCheckpy, StreamLog, StreamRecorder
+
+
+def record(path, frames):
+    with StreamRecorder(path) as recorder:
+        received = time.time()
+
+        for i, frame in enumerate(frames):
+            recorder.write(frame, received + i * 0.0001)
+
+
+def read(path):
+    for _ in StreamLog(path):
+        pass
+
+
+async def replay(path, count):
+    stream = StreamCheckpy('bench', 'bench', initial_subscribes=[], source=ReplaySource(path))
+    received = 0
+
+    async for _ in stream:
+        received += 1
+
+    assert received == count
+
+
+def bench(label, func, n):
+    start = time.perf_counter()
+    func()
+    print(f'{label:<24} {n / (time.perf_counter() - start):12,.0f} frames/sec')
+
+
+def main():
+    # Pass a recorded log to replay real traffic instead of synthetic frames.
+    frames = None if len(sys.argv) > 1 else generate_frames(200000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(directory, 'frames.log')
+
+        if frames is not None:
+            bench('record', lambda: record(path, frames), len(frames))
+            print(f'{"log size":<24} {os.path.getsize(path) / sum(len(frame) for frame in frames):12.1%} of raw')
+
+        count = sum(1 for _ in StreamLog(path))
+        bench('read log', lambda: read(path), count)
+        bench('replay via StreamCheckpy', lambda: asyncio.run(replay(path, count)), count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+
+def bench_import(repeat=5):
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import checkpy'], check=True)
+        best = min(best, time.perf_counter() - start)
+
+    print(f'{"import checkpy (process)":<32} {best * 1e3:10.1f} ms')
+
+
+def bench(label, func, n=200):
+    start = time.perf_counter()
+
+    for _ in range(n):
+        func()
+
+    print(f'{label:<32} {(time.perf_counter() - start) / n * 1e6:10.1f} us/call')
+
+
+def main():
+    bench_import()
+
+    from checkpy import RestCheckpy, StreamCheckpy
+    from checkpy.fieldmap import load_field_map
+
+    def parse_per_instance():
+        with open('checkpy/translate.json') as f:
+            json.load(f)
+
+    bench('json.load per instance (old)', parse_per_instance)
+    bench('load_field_map (shared)', load_field_map)
+    bench('RestCheckpy()', lambda: RestCheckpy('bench', 'bench').close())
+    bench('StreamCheckpy()', lambda: StreamCheckpy('bench', 'bench', initial_subscribes=[]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import json
+import random
+import sys
+import time
+
+sys.path.insert(0, '.')
+
+from checkpy import StreamCheckpy
+from checkpy.fieldmap import load_field_map
+
+TRANSACTION_FIELDS = ['F16013', 'F15001', 'F15009', 'F15010', 'F15011', 'F15006', 'F15472', 'F15004', 'F15020', 'F15015', 'F15023', 'F15019', 'F14501', 'F14531']
+ORDERBOOK_FIELDS = ['F16013', 'F30531'] + [f'F{14501 + i}' for i in range(10)] + [f'F{14511 + i}' for i in range(10)] + [f'F{14531 + i}' for i in range(10)] + [f'F{14541 + i}' for i in range(10)]
+
+
+def generate_frames(n):
+    frames = []
+
+    for i in range(n):
+        fields = ORDERBOOK_FIELDS if i % 3 == 0 else TRANSACTION_FIELDS
+        data = {key: random.randint(1, 1000000) for key in fields}
+        data['F16013'] = random.choice(['005930', '000660', '035420', '051910'])
+        frames.append(json.dumps({'data': data}))
+
+    return frames
+
+
+def load_frames(path):
+    with open(path) as f:
+        return [line.rstrip('\n') for line in f if line.strip() != '']
+
+
+def legacy_process(frames, translate):
+    for msg in frames:
+        parsed_msg = json.loads(msg)
+
+        if 'data' in parsed_msg.keys():
+            {translate.get(key): value for key, value in parsed_msg.get('data').items() if key in translate.keys()}
+
+
+def replay(stream, frames):
+    process_msg = stream._StreamCheckpy__process_msg
+
+    for msg in frames:
+        process_msg(msg)
+
+
+def bench(label, func, n):
+    start = time.perf_counter()
+    func()
+    print(f'{label:<24} {n / (time.perf_counter() - start):12,.0f} frames/sec')
+
+
+def main():
+    # Pass a file with one raw frame per line to replay recorded traffic instead of synthetic frames.
+    frames = load_frames(sys.argv[1]) if len(sys.argv) > 1 else generate_frames(200000)
+    translate = dict(load_field_map())
+
+    bench('legacy comprehension', lambda: legacy_process(frames, translate), len(frames))
+
+    for backend in ['json', 'orjson', 'msgspec']:
+        try:
+            stream = StreamCheckpy('bench', 'bench', initial_subscribes=[], json_backend=backend)
+
+        except ImportError:
+            print(f'{backend:<24} {"not installed":>12}')
+
+            continue
+
+        bench(f'{backend} + key maps', lambda: replay(stream, frames), len(frames))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import multiprocessing
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, '.')
+
+from checkpy import OrderbookTick, TickBus, TickBusReader, TransactionTick
+
+RECORDS = 200000
+
+
+def generate_msgs(n):
+    msgs = []
+
+    for i in range(n):
+        fields = OrderbookTick.FIELDS if i % 3 == 0 else TransactionTick.FIELDS
+        msgs.append({name: random.randint(1, 1000000) for name in fields if name != 'ABBV_CODE'})
+
+    return msgs
+
+
+def consume(name, total, barrier, results):
+    reader = TickBusReader(name, start=0)
+    latencies, received = [], 0
+    barrier.wait()
+
+    while reader.position < total:
+        view = reader.read(timeout=1)
+
+        if len(view) > 0:
+            latencies.append(time.time_ns() - view['RECV_NS'])
+            received += len(view)
+
+    results.put((received, reader.lapped, np.concatenate(latencies) if latencies != [] else np.zeros(1)))
+    reader.close()
+
+
+def bench(consumers, msgs, rate):
+    bus = TickBus(capacity=1 << 16)
+    barrier = multiprocessing.Barrier(consumers + 1)
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=consume, args=(bus.name, len(msgs), barrier, results)) for _ in range(consumers)]
+
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+
+    for i, msg in enumerate(msgs):
+        bus.publish('001002005930', msg)
+
+        # Optional pacing to measure latency below saturation.
+        if rate is not None:
+            while time.perf_counter() - start < i / rate:
+                pass
+
+    elapsed = time.perf_counter() - start
+    outcomes = [results.get() for _ in workers]
+
+    for worker in workers:
+        worker.join()
+
+    latencies = np.concatenate([outcome[2] for outcome in outcomes]) / 1000
+    received = sum(outcome[0] for outcome in outcomes)
+    lapped = sum(outcome[1] for outcome in outcomes)
+    print(f'{consumers:>3} consumers  publish {len(msgs) / elapsed:10,.0f} rec/sec  delivered {received / (consumers * len(msgs)):7.1%}  lapped {lapped:>8,}  latency p50 {np.percentile(latencies, 50):9,.0f}us  p99 {np.percentile(latencies, 99):9,.0f}us')
+
+    bus.close()
+    bus.unlink()
+
+
+def main():
+    # Usage: python benchmarks/bench_tickbus.py [records per second]; without a rate the producer runs flat out.
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    msgs = generate_msgs(RECORDS)
+
+    for consumers in [1, 4, 16]:
+        bench(consumers, msgs, rate)
+
+
+if __name__ == '__main__':
+    main()
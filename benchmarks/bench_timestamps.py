@@ -0,0 +1,49 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, '.')
+
+from checkpy.decode import Decoder
+
+
+def generate_day(n):
+    # n ticks spread evenly over the 09:00-15:30 session, at hundredth-of-a-second resolution.
+    centis = np.sort(np.random.randint(0, 6 * 3600 * 100 + 30 * 60 * 100, size=n)) + 9 * 3600 * 100
+    seconds, hundredths = centis // 100, centis % 100
+    times = (seconds // 3600) * 1000000 + (seconds // 60 % 60) * 10000 + (seconds % 60) * 100 + hundredths
+
+    return pd.Series(np.full(n, 20240102, dtype='float64')), pd.Series(times.astype('float64'))
+
+
+def string_path(dates, times):
+    return pd.to_datetime(dates.astype('int64').astype(str) + times.astype('int64').astype(str).str.zfill(8), format='%Y%m%d%H%M%S%f')
+
+
+def integer_path(dates, times):
+    return Decoder.to_datetime_index(Decoder.to_epoch_ns(dates, times))
+
+
+def bench(label, func, *args, repeat=3):
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    print(f'{label:<24} {best * 1e3:10.1f} ms')
+
+
+def main(n=1000000):
+    dates, times = generate_day(n)
+    assert (string_path(dates, times).values.astype('datetime64[ns]') == integer_path(dates, times).tz_localize(None).values).all()
+
+    print(f'{n} intraday timestamps')
+    bench('string to_datetime', string_path, dates, times)
+    bench('integer decoder', integer_path, dates, times)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import json
+import sys
+import threading
+import time
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, '.')
+
+from checkpy import RestCheckpy
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = json.dumps({'success': True, 'results': [{'F16013': '005930', 'F15001': 71000, 'F15015': 1234567}]}).encode()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def bench(label, func, n):
+    func()
+    start = time.perf_counter()
+
+    for _ in range(n):
+        func()
+
+    elapsed = time.perf_counter() - start
+    print(f'{label:<24} {elapsed / n * 1e6:10.1f} us/call')
+
+
+def main(n=2000):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_uri = f'http://127.0.0.1:{server.server_address[1]}'
+    payload = {'cust_id': 'bench', 'auth_key': 'bench', 'codelist': '005930'}
+
+    bench('bare requests.post', lambda: requests.post(f'{base_uri}/stock/m001/basic_info_all_port', data=payload).json(), n)
+
+    with RestCheckpy('bench', 'bench', rest_base_uri=base_uri) as client:
+        session = client._RestCheckpy__session
+        bench('pooled session.post', lambda: session.post(f'{base_uri}/stock/m001/basic_info_all_port', data=payload).json(), n)
+        bench('pooled get_*_infos', lambda: client.get_kospi_stock_basic_infos(['005930']), n)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,20 @@
 
 from .version import version as __version__
 
-from .restcheck import RestCheckpy
+from .restcheck import RestCheckpy, ChunkError
+from .refcache import TTLCache
+from .ratelimit import RateLimiter
+from .asyncrestcheck import AsyncRestCheckpy
 from .streamcheck import StreamCheckpy
+from .shardstream import ShardedStreamCheckpy
+from .records import TickRecord, TransactionTick, OrderbookTick, StreamEvent
+from .tickstore import TickStore, TickRing
+from .bars import BarAggregator
+from .backfill import TickBackfiller
+from .replay import StreamRecorder, StreamLog, ReplaySource
+from .gateway import StreamGateway, GatewayClient
+from .tickbus import TickBus, TickBusReader
+from .orderbook import OrderBook, OrderBookStore
+from .quotes import QuoteTable
+from .intraday import IntradayPoller
 from .checkenum import *
\ No newline at end of file
@@ -0,0 +1,34 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .restcheck import RestCheckpy, TimeSeriesType
+
+
+class AsyncRestCheckpy(RestCheckpy):
+    # Every get_* method of RestCheckpy funnels into _fetch_data, so overriding it with a coroutine turns all of them into awaitables.
+    def __init__(self, user_id, user_key, max_concurrency: int = 16, **kwargs):
+        kwargs.setdefault('pool_size', max_concurrency)
+        super().__init__(user_id, user_key, **kwargs)
+        self.__executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='checkpy')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+        super().close()
+
+    async def _run(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, partial(func, *args, **kwargs))
+
+    async def _fetch_data(self, end_point, payload, is_time_series: TimeSeriesType, output: str = None):
+        return await self._run(super()._fetch_data, end_point=end_point, payload=payload, is_time_series=is_time_series, output=output)
+
+    async def _fetch_port_data(self, end_point, payload, tickers: list, is_time_series: TimeSeriesType, output: str = None):
+        results = await asyncio.gather(*[self._run(self._fetch_chunk, end_point, payload, chunk, is_time_series, output) for chunk in self._chunk_tickers(tickers)])
+
+        return self._merge_chunks(results, is_time_series=is_time_series, output=output)
@@ -0,0 +1,69 @@
+from datetime import datetime
+from operator import itemgetter
+from zoneinfo import ZoneInfo
+
+from .checkenum import OutputType
+from .codes import market_methods, require_sync_client
+
+
+class TickBackfiller(object):
+    # Refetches missed transactions of a subscribe code from the tick_date endpoint of its market and reshapes the rows
+    # into stream messages, so a consumer sees the same keys as for live ticks.
+    TICK_METHODS = market_methods('tick_info', stock_name='tick_data')
+    FIELDS = {'TR_TIME': 'TR_TIME', 'LAST': 'INTRA_CLOSE', 'TR_VOL': 'INTRA_TR_VOL', 'VOL': 'INTRA_CUM_VOL', 'CHANGE': 'INTRA_CHANGE', 'RET': 'INTRA_RET', 'UP_DOWN': 'INTRA_UP_DOWN', 'ASK1': 'INTRA_ASK1', 'BID1': 'INTRA_BID1', 'OI': 'INTRA_OI'}
+    TIMEZONE = ZoneInfo('Asia/Seoul')
+
+    def __init__(self, rest_client):
+        # Backfills run in an executor thread and need plain results, so AsyncRestCheckpy cannot be used here.
+        require_sync_client(rest_client, 'TickBackfiller')
+
+        self.__client = rest_client
+
+    @staticmethod
+    def supports(code: str) -> bool:
+        return code[:5] in TickBackfiller.TICK_METHODS
+
+    @staticmethod
+    def parse_tr_time(value) -> int:
+        # TR_TIME arrives as a string or a number depending on the source; None when it is missing or malformed.
+        try:
+            return int(float(value))
+
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def __to_tr_time(timestamp: float) -> int:
+        return int(datetime.fromtimestamp(timestamp, TickBackfiller.TIMEZONE).strftime('%H%M%S')) * 100
+
+    def fetch(self, code: str, after_tr_time: int = None, since: float = None, seen: int = 0) -> list:
+        # Rows after after_tr_time, or after the wall clock time since when no tick of the code was seen yet. Several ticks can
+        # share one hundredth, so rows at after_tr_time itself are returned past the seen ones already delivered.
+        date = datetime.now(TickBackfiller.TIMEZONE).strftime('%Y%m%d')
+        rows = getattr(self.__client, TickBackfiller.TICK_METHODS[code[:5]])(code[6:], date, output=OutputType.RAW) or []
+        after = self.parse_tr_time(after_tr_time) if after_tr_time is not None else None
+        after, inclusive = (after, True) if after is not None else (self.__to_tr_time(since), False) if since is not None else (-1, False)
+        timed = []
+
+        for row in rows:
+            tr_time = self.parse_tr_time(row.get('TR_TIME', row.get('INTRA_TIME')))
+
+            if tr_time is not None and (tr_time > after or (inclusive and tr_time == after)):
+                timed.append((tr_time, row))
+
+        timed.sort(key=itemgetter(0))
+        ticks = []
+
+        for tr_time, row in timed:
+            if tr_time == after and seen > 0:
+                seen -= 1
+
+                continue
+
+            # TR_TIME keeps the row's own value, like every other field, so backfilled ticks match the types of the source.
+            tick = {'ABBV_CODE': code[6:]}
+            tick.update({name: row[rest_name] for name, rest_name in TickBackfiller.FIELDS.items() if row.get(rest_name) is not None})
+            tick['TR_TIME'] = row.get('TR_TIME', row.get('INTRA_TIME'))
+            ticks.append(tick)
+
+        return ticks
@@ -0,0 +1,189 @@
+import logging
+import numpy as np
+from collections import deque
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from .checkenum import BarType, OutputType, SubType
+from .decode import Decoder
+from .records import StreamEvent
+
+
+class BarAggregator(object):
+    # Bars carry the column names of the REST intra kline frames, so to_frame output can be concatenated with them.
+    BAR_FIELDS = ('INTRA_OPEN', 'INTRA_HIGH', 'INTRA_LOW', 'INTRA_CLOSE', 'INTRA_VOL', 'INTRA_AMT', 'INTRA_CUM_VOL', 'INTRA_CUM_AMT')
+    TIMEZONE = ZoneInfo(Decoder.TIMEZONE)
+
+    def __init__(self, stream, bar_type: BarType = BarType.TIME, size: float = 60, callback=None, allowed_lateness: float = 0, max_bars: int = 10000, date: str = None):
+        self.__stream = stream
+        self.__bar_type = BarType(bar_type)
+        self.__size = size
+        self.__callback = callback
+        self.__allowed_lateness = round(allowed_lateness * 100)
+        self.__max_bars = max_bars
+        self.__date = int(date) if date is not None else None
+        self.__open = {}
+        self.__closed = {}
+        self.__watermarks = {}
+        self.__emitted = {}
+        self.__late = 0
+
+    def __call__(self, msg):
+        self.update(msg)
+
+    @property
+    def late(self) -> int:
+        return self.__late
+
+    def codes(self) -> list:
+        return list(self.__closed.keys())
+
+    def bars(self, code) -> list:
+        return list(self.__closed.get(code, ()))
+
+    def __today(self) -> int:
+        return self.__date if self.__date is not None else int(datetime.now(BarAggregator.TIMEZONE).strftime('%Y%m%d'))
+
+    @staticmethod
+    def __to_hundredths(tr_time: int) -> int:
+        return (tr_time // 1000000 * 3600 + tr_time // 10000 % 100 * 60 + tr_time // 100 % 100) * 100 + tr_time % 100
+
+    @staticmethod
+    def __to_tr_time(hundredths: int) -> int:
+        seconds, fraction = divmod(hundredths, 100)
+
+        return (seconds // 3600 * 10000 + seconds // 60 % 60 * 100 + seconds % 60) * 100 + fraction
+
+    @staticmethod
+    def __to_float(value):
+        try:
+            return float(value)
+
+        except (TypeError, ValueError):
+            return None
+
+    def __new_bar(self, tr_time, price):
+        return {'INTRA_DATE': self.__today(), 'INTRA_TIME': tr_time, 'INTRA_OPEN': price, 'INTRA_HIGH': price, 'INTRA_LOW': price, 'INTRA_CLOSE': price, 'INTRA_VOL': 0.0, 'INTRA_AMT': 0.0, 'INTRA_CUM_VOL': None, 'INTRA_CUM_AMT': None, 'TICKS': 0}
+
+    @staticmethod
+    def __add(bar, price, volume, msg):
+        bar['INTRA_HIGH'] = max(bar['INTRA_HIGH'], price)
+        bar['INTRA_LOW'] = min(bar['INTRA_LOW'], price)
+        bar['INTRA_CLOSE'] = price
+        bar['INTRA_VOL'] += volume
+        # Per-bar amount is traded price times volume, while the cumulative columns are taken as reported by the exchange.
+        bar['INTRA_AMT'] += price * volume
+        bar['INTRA_CUM_VOL'] = BarAggregator.__to_float(msg.get('VOL')) or bar['INTRA_CUM_VOL']
+        bar['INTRA_CUM_AMT'] = BarAggregator.__to_float(msg.get('AMT')) or bar['INTRA_CUM_AMT']
+        bar['TICKS'] += 1
+
+    def __emit(self, code, bar):
+        del bar['TICKS']
+        closed = self.__closed.get(code)
+
+        if closed is None:
+            closed = self.__closed[code] = deque(maxlen=self.__max_bars)
+
+        closed.append(bar)
+
+        if self.__callback is not None:
+            try:
+                self.__callback(code, bar)
+
+            except Exception:
+                logging.exception(f'Bar callback failed for {code}')
+
+    def update(self, msg):
+        if isinstance(msg, StreamEvent) or self.__stream.msg_sub_type(msg) != SubType.TRANSACTION:
+            return
+
+        price, tr_time = msg.get('LAST'), msg.get('TR_TIME')
+
+        try:
+            price, tr_time, volume = float(price), int(float(tr_time)), float(msg.get('TR_VOL') or 0)
+
+        except (TypeError, ValueError):
+            return
+
+        code = self.__stream.msg_code(msg)
+
+        if self.__bar_type == BarType.TIME:
+            self.__update_time(code, price, tr_time, volume, msg)
+
+        else:
+            self.__update_count(code, price, tr_time, volume, msg)
+
+    def __update_count(self, code, price, tr_time, volume, msg):
+        bar = self.__open.get(code)
+
+        if bar is None:
+            bar = self.__open[code] = self.__new_bar(tr_time, price)
+
+        self.__add(bar, price, volume, msg)
+
+        if (bar['TICKS'] if self.__bar_type == BarType.TICK else bar['INTRA_VOL']) >= self.__size:
+            del self.__open[code]
+            self.__emit(code, bar)
+
+    def __update_time(self, code, price, tr_time, volume, msg):
+        # Bars are keyed by event time and labelled with their start. A bar is closed once a tick at or past its end,
+        # plus the allowed lateness, has been seen, and ticks for bars that are already closed are counted and dropped.
+        size = round(self.__size * 100)
+        hundredths = self.__to_hundredths(tr_time)
+        start = hundredths // size * size
+
+        if start < self.__emitted.get(code, -1):
+            self.__late += 1
+
+            return
+
+        open_bars = self.__open.get(code)
+
+        if open_bars is None:
+            open_bars = self.__open[code] = {}
+
+        bar = open_bars.get(start)
+
+        if bar is None:
+            bar = open_bars[start] = self.__new_bar(self.__to_tr_time(start), price)
+
+        self.__add(bar, price, volume, msg)
+
+        watermark = self.__watermarks[code] = max(self.__watermarks.get(code, 0), hundredths)
+
+        for bar_start in sorted(open_bars.keys()):
+            if bar_start + size + self.__allowed_lateness > watermark:
+                break
+
+            self.__emitted[code] = bar_start + size
+            self.__emit(code, open_bars.pop(bar_start))
+
+    def flush(self, code=None):
+        # Closes the open bars regardless of event time, e.g. at the end of a session.
+        for bar_code in ([code] if code is not None else list(self.__open.keys())):
+            open_bars = self.__open.pop(bar_code, None)
+
+            if open_bars is None:
+                continue
+
+            if self.__bar_type == BarType.TIME:
+                for bar_start in sorted(open_bars.keys()):
+                    self.__emitted[bar_code] = bar_start + round(self.__size * 100)
+                    self.__emit(bar_code, open_bars[bar_start])
+
+            else:
+                self.__emit(bar_code, open_bars)
+
+    def to_frame(self, code, output: str = None):
+        bars = self.__closed.get(code)
+
+        if not bars:
+            return
+
+        if OutputType(output or OutputType.PANDAS) == OutputType.RAW:
+            return list(bars)
+
+        columns = {name: np.array([bar[name] for bar in bars], dtype='float64') for name in BarAggregator.BAR_FIELDS}
+        index = Decoder.to_epoch_ns([bar['INTRA_DATE'] for bar in bars], [bar['INTRA_TIME'] for bar in bars])
+
+        return Decoder.build(columns, index, OutputType(output or OutputType.PANDAS))
@@ -21,3 +21,34 @@ class SubType(StrEnum):
 class SubscribeStatus(IntEnum):
     SUBSCRIBED = 0
     UNSUBSCRIBED = 1
+
+
+class OutputType(StrEnum):
+    PANDAS = 'pandas'
+    NUMPY = 'numpy'
+    ARROW = 'arrow'
+    RAW = 'raw'
+
+
+class RequestPriority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class BackpressurePolicy(StrEnum):
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop_oldest'
+    CONFLATE = 'conflate'
+
+
+class BarType(StrEnum):
+    TICK = 'tick'
+    VOLUME = 'volume'
+    TIME = 'time'
+
+
+class StreamEventType(StrEnum):
+    DISCONNECTED = 'disconnected'
+    RECONNECTED = 'reconnected'
+    BACKFILLED = 'backfilled'
\ No newline at end of file
@@ -0,0 +1,65 @@
+import inspect
+
+from .checkenum import MarketType, SubType
+from .records import TickRecord
+
+# REST method prefix of every market that has a subscribe MarketType, as in get_{prefix}_basic_infos.
+MARKET_PREFIXES = {MarketType.KOSPI_STOCK: 'kospi_stock', MarketType.KOSDAQ_STOCK: 'kosdaq_stock', MarketType.K200_FUTURES: 'k200_futures', MarketType.KQ150_FUTURES: 'kq150_futures', MarketType.STOCK_FUTURES: 'stock_futures', MarketType.K200_MINI_F: 'k200_mini_futures', MarketType.K200_OPTION: 'k200_option'}
+STOCK_MARKETS = (MarketType.KOSPI_STOCK, MarketType.KOSDAQ_STOCK)
+
+
+def generate_code(market_type: MarketType, sub_type: SubType, ticker) -> str:
+    return f'{market_type}{sub_type}{ticker}'
+
+
+def market_methods(name: str, stock_name: str = None) -> dict:
+    # {MarketType: 'get_{prefix}_{name}'}; stock_name covers endpoints that are named differently for stocks.
+    return {market_type: f'get_{prefix}_{stock_name if stock_name is not None and market_type in STOCK_MARKETS else name}' for market_type, prefix in MARKET_PREFIXES.items()}
+
+
+def require_sync_client(rest_client, owner: str):
+    # AsyncRestCheckpy turns every get_* method into a coroutine, so helpers that need plain results refuse it up front.
+    if inspect.iscoroutinefunction(getattr(rest_client, '_fetch_data', None)):
+        raise TypeError(f'{owner} needs a synchronous RestCheckpy, not AsyncRestCheckpy')
+
+
+def msg_sub_type(msg) -> SubType:
+    # Orderbook frames are the only ones carrying level quantities, which tells the two feeds of a ticker apart.
+    if isinstance(msg, TickRecord):
+        return msg.SUB_TYPE
+
+    return SubType.ORDERBOOK if 'ASK1_Q' in msg or 'BID1_Q' in msg else SubType.TRANSACTION
+
+
+class CodeIndex(object):
+    # Frames carry the ticker but not the market, so a message is matched back to its subscribe code by (SubType, ticker).
+    def __init__(self, codes=()):
+        self.__codes = {}
+
+        for code in codes:
+            self.add(code)
+
+    @staticmethod
+    def __key(code: str) -> tuple:
+        return SubType(code[5]), code[6:]
+
+    def __contains__(self, code):
+        return self.__key(code) in self.__codes
+
+    def __len__(self):
+        return len(self.__codes)
+
+    def add(self, code: str) -> bool:
+        key = self.__key(code)
+        added = key not in self.__codes
+        self.__codes[key] = code
+
+        return added
+
+    def discard(self, code: str) -> bool:
+        return self.__codes.pop(self.__key(code), None) is not None
+
+    def msg_code(self, msg) -> str:
+        sub_type, ticker = msg_sub_type(msg), msg.get('ABBV_CODE')
+
+        return self.__codes.get((sub_type, ticker), f'{sub_type}{ticker}')
@@ -0,0 +1,175 @@
+import numpy as np
+from functools import lru_cache
+from operator import itemgetter
+
+from .checkenum import OutputType
+from .fieldmap import load_field_map
+
+
+class Decoder(object):
+    STRING_TYPES = ('CHAR', 'VARCHAR')
+    TIMEZONE = 'Asia/Seoul'
+    UTC_OFFSET_NS = 9 * 3600 * 10 ** 9
+
+    def __init__(self, translate: dict, types: dict):
+        self.__translate = translate
+        self.__numeric = frozenset(key for key, sql_type in types.items() if not sql_type.startswith(Decoder.STRING_TYPES))
+        self.__layouts = {}
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def shared() -> 'Decoder':
+        fields = load_field_map()
+
+        return Decoder(fields, fields.types)
+
+    def __get_layout(self, keys: tuple):
+        # Responses of one endpoint always carry the same keys, so the mapped field list is built once per key set.
+        layout = self.__layouts.get(keys)
+
+        if layout is None:
+            fields, names = [], set()
+
+            for key in keys:
+                name = self.__translate.get(key)
+
+                if name is not None and name not in names:
+                    fields.append((key, name, key in self.__numeric))
+                    names.add(name)
+
+            layout = self.__layouts[keys] = (fields, itemgetter(*[key for key, _, _ in fields]) if fields != [] else None)
+
+        return layout
+
+    @staticmethod
+    def __to_numeric(values):
+        try:
+            return values.astype('float64')
+
+        except (TypeError, ValueError):
+            import pandas as pd
+
+            return pd.to_numeric(values, errors='coerce').astype('float64')
+
+    def translate(self, results: list) -> list:
+        fields, _ = self.__get_layout(tuple(results[0].keys()))
+
+        return [{name: result.get(key) for key, name, _ in fields} for result in results]
+
+    def decode(self, results: list) -> dict:
+        fields, getter = self.__get_layout(tuple(results[0].keys()))
+
+        if getter is None:
+            return {}
+
+        try:
+            rows = list(map(getter, results))
+
+        except KeyError:
+            rows = [tuple(result.get(key) for key, _, _ in fields) for result in results]
+
+        values = np.empty((len(rows), len(fields)), dtype=object)
+        values[:] = rows if len(fields) > 1 else [[row] for row in rows]
+
+        return {name: self.__to_numeric(values[:, i]) if is_numeric else values[:, i] for i, (_, name, is_numeric) in enumerate(fields)}
+
+    @staticmethod
+    def to_epoch_ns(dates, times=None) -> np.ndarray:
+        # dates are YYYYMMDD and times HHMMSSff integers in KST, which has had a fixed +09:00 offset since 1988.
+        dates = np.asarray(dates, dtype='float64')
+        invalid = np.isnan(dates)
+        dates = np.where(invalid, 19700101, dates).astype('int64')
+
+        months = (dates // 10000 - 1970) * 12 + dates // 100 % 100 - 1
+        days = months.astype('datetime64[M]').astype('datetime64[D]').astype('int64') + dates % 100 - 1
+        ns = days * 86400 * 10 ** 9 - Decoder.UTC_OFFSET_NS
+
+        if times is not None:
+            times = np.asarray(times, dtype='float64')
+            invalid |= np.isnan(times)
+            times = np.where(invalid, 0, times).astype('int64')
+            ns += ((times // 1000000) * 3600 + (times // 10000 % 100) * 60 + times // 100 % 100) * 10 ** 9 + (times % 100) * 10 ** 7
+
+        ns[invalid] = np.iinfo('int64').min
+
+        return ns
+
+    @staticmethod
+    def to_datetime_index(ns, name: str = 'TIME'):
+        # ns is UTC epoch nanoseconds as int64 or datetime64[ns], as kept by build and by NUMPY output.
+        import pandas as pd
+
+        return pd.DatetimeIndex(np.asarray(ns).view('datetime64[ns]'), name=name).tz_localize('UTC').tz_convert(Decoder.TIMEZONE)
+
+    @staticmethod
+    def build(columns: dict, index: np.ndarray, output: OutputType):
+        if index is not None:
+            order = np.argsort(index, kind='stable')
+            index = index[order]
+            columns = {name: values[order] for name, values in columns.items()}
+
+        if output == OutputType.NUMPY:
+            # TIME is stored as UTC datetime64[ns] since structured arrays carry no time zone.
+            dtype = ([('TIME', 'datetime64[ns]')] if index is not None else []) + [(name, values.dtype) for name, values in columns.items()]
+            array = np.empty(len(index) if index is not None else len(next(iter(columns.values()), [])), dtype=dtype)
+
+            if index is not None:
+                array['TIME'] = index.view('datetime64[ns]')
+
+            for name, values in columns.items():
+                array[name] = values
+
+            return array
+
+        elif output == OutputType.ARROW:
+            import pyarrow as pa
+
+            arrays = {'TIME': pa.array(index.view('datetime64[ns]'), type=pa.timestamp('ns', tz=Decoder.TIMEZONE))} if index is not None else {}
+
+            return pa.table({**arrays, **{name: pa.array(values, from_pandas=True) for name, values in columns.items()}})
+
+        else:
+            import pandas as pd
+
+            return pd.DataFrame(columns, index=Decoder.to_datetime_index(index) if index is not None else None, copy=False)
+
+    @staticmethod
+    def from_frame(df, output: OutputType):
+        if output == OutputType.NUMPY:
+            return df.tz_convert('UTC').tz_localize(None).to_records() if df.index.name == 'TIME' else df.to_records(index=False)
+
+        elif output == OutputType.ARROW:
+            import pyarrow as pa
+
+            return pa.Table.from_pandas(df, preserve_index=df.index.name == 'TIME')
+
+        elif output == OutputType.RAW:
+            return df.reset_index().to_dict('records') if df.index.name == 'TIME' else df.to_dict('records')
+
+        return df
+
+    @staticmethod
+    def concat(parts: list, output: OutputType, is_time_series: bool):
+        if len(parts) == 1:
+            return parts[0]
+
+        if output == OutputType.NUMPY:
+            array = np.concatenate(parts)
+
+            return array[np.argsort(array['TIME'], kind='stable')] if is_time_series else array
+
+        elif output == OutputType.ARROW:
+            import pyarrow as pa
+
+            table = pa.concat_tables(parts)
+
+            return table.sort_by('TIME') if is_time_series else table
+
+        elif output == OutputType.RAW:
+            return [record for part in parts for record in part]
+
+        import pandas as pd
+
+        df = pd.concat(parts, ignore_index=not is_time_series)
+
+        return df.sort_index(kind='stable') if is_time_series else df
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+from .checkenum import BackpressurePolicy
+
+
+class TickQueue(object):
+    # Bounded hand-off between the websocket reader and the consumer. With CONFLATE only the latest tick per key is kept,
+    # and with a flush_interval the pending ticks are released as one batch per interval instead of as soon as the consumer asks.
+    # A None key marks a tick that must not be conflated; a full CONFLATE queue evicts the oldest keyed tick, and blocks like
+    # BLOCK when only unkeyed ticks are pending.
+    def __init__(self, maxsize: int = 10000, policy: BackpressurePolicy = BackpressurePolicy.BLOCK, flush_interval: float = None):
+        self.__maxsize = maxsize
+        self.__policy = BackpressurePolicy(policy)
+        self.__items = OrderedDict() if self.__policy == BackpressurePolicy.CONFLATE else deque()
+        self.__keyed = OrderedDict()
+        self.__flush_interval = flush_interval
+        self.__batch = deque()
+        self.__flushed_at = 0.0
+        self.__not_empty = asyncio.Event()
+        self.__not_full = asyncio.Event()
+        self.__not_full.set()
+        self.__dropped = 0
+        self.__conflated = 0
+
+    def __len__(self):
+        return len(self.__batch) + len(self.__items)
+
+    @property
+    def dropped(self) -> int:
+        return self.__dropped
+
+    @property
+    def conflated(self) -> int:
+        return self.__conflated
+
+    def put_nowait(self, key, item) -> bool:
+        if self.__policy == BackpressurePolicy.CONFLATE:
+            if key is not None and key in self.__items:
+                self.__items[key] = item
+                self.__conflated += 1
+
+                return True
+
+            if len(self.__items) >= self.__maxsize:
+                if len(self.__keyed) == 0:
+                    self.__not_full.clear()
+
+                    return False
+
+                del self.__items[self.__keyed.popitem(last=False)[0]]
+                self.__dropped += 1
+
+            if key is None:
+                key = object()
+
+            else:
+                self.__keyed[key] = None
+
+            self.__items[key] = item
+
+        elif len(self.__items) >= self.__maxsize:
+            if self.__policy == BackpressurePolicy.BLOCK:
+                self.__not_full.clear()
+
+                return False
+
+            self.__items.popleft()
+            self.__items.append(item)
+            self.__dropped += 1
+
+        else:
+            self.__items.append(item)
+
+        self.__not_empty.set()
+
+        return True
+
+    async def put(self, key, item):
+        while not self.put_nowait(key, item):
+            await self.__not_full.wait()
+
+    def __flush(self):
+        self.__batch.extend(self.__items.values() if self.__policy == BackpressurePolicy.CONFLATE else self.__items)
+        self.__items.clear()
+        self.__keyed.clear()
+        self.__not_empty.clear()
+        self.__not_full.set()
+        self.__flushed_at = time.monotonic()
+
+    def get_nowait(self):
+        if len(self.__batch) > 0:
+            return self.__batch.popleft()
+
+        if self.__flush_interval is not None:
+            self.__flush()
+
+            return self.__batch.popleft()
+
+        if self.__policy == BackpressurePolicy.CONFLATE:
+            key, item = self.__items.popitem(last=False)
+            self.__keyed.pop(key, None)
+
+        else:
+            item = self.__items.popleft()
+
+        if len(self.__items) == 0:
+            self.__not_empty.clear()
+
+        self.__not_full.set()
+
+        return item
+
+    async def get(self):
+        if len(self.__batch) == 0 and self.__flush_interval is not None:
+            delay = self.__flushed_at + self.__flush_interval - time.monotonic()
+
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        while len(self) == 0:
+            await self.__not_empty.wait()
+
+        return self.get_nowait()
@@ -0,0 +1,51 @@
+import json
+from collections.abc import Mapping
+from functools import lru_cache
+from importlib.resources import files
+from types import MappingProxyType
+
+
+class FieldMap(Mapping):
+    # Immutable view of translate.json (F-code -> field name) with the reverse lookup and the SQL types of Table.xlsx.
+    def __init__(self, translate: dict, types: dict):
+        reverse = {}
+
+        for code, name in translate.items():
+            reverse.setdefault(name, []).append(code)
+
+        self.__translate = MappingProxyType(dict(translate))
+        self.__reverse = MappingProxyType({name: tuple(codes) for name, codes in reverse.items()})
+        self.__types = MappingProxyType(dict(types))
+
+    def __getitem__(self, code):
+        return self.__translate[code]
+
+    def __iter__(self):
+        return iter(self.__translate)
+
+    def __len__(self):
+        return len(self.__translate)
+
+    def __contains__(self, code):
+        return code in self.__translate
+
+    def get(self, code, default=None):
+        return self.__translate.get(code, default)
+
+    @property
+    def reverse(self) -> Mapping:
+        return self.__reverse
+
+    @property
+    def types(self) -> Mapping:
+        return self.__types
+
+    def codes(self, name: str) -> tuple:
+        return self.__reverse.get(name, ())
+
+
+@lru_cache(maxsize=None)
+def load_field_map() -> FieldMap:
+    package = files(__package__)
+
+    return FieldMap(json.loads(package.joinpath('translate.json').read_text()), json.loads(package.joinpath('types.json').read_text()))
@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+
+from .checkenum import *
+from .codes import CodeIndex, generate_code, msg_sub_type
+from .records import RECORD_TYPES, StreamEvent
+from .streamcheck import StreamCheckpy
+from typing import List, Tuple, Union
+
+# Longest line either side reads, and the most subscribes a client packs into one request line so it stays far below it.
+LINE_LIMIT = 2 ** 20
+REQUEST_CHUNK = 1000
+
+
+class StreamGateway(object):
+    # Owns one upstream StreamCheckpy and serves local clients over a Unix socket. A code is subscribed upstream while at least
+    # one client wants it, each tick is serialised once, and a client whose socket buffer passes max_buffer misses ticks
+    # instead of slowing down the others. Lines are JSON: {"op": ..., "subscribes": [...]} in, {"code": ..., "msg": ...} out.
+    def __init__(self, user_id, user_key, path: str = '/tmp/checkpy.sock', max_buffer: int = 4 * 2 ** 20, **stream_kwargs):
+        self.__path = path
+        self.__max_buffer = max_buffer
+        self.__stream = StreamCheckpy(user_id, user_key, [], **stream_kwargs)
+        self.__clients = {}
+        self.__subscribers = {}
+        self.__dropped = {}
+
+    def stats(self) -> dict:
+        return {'clients': len(self.__clients), 'codes': len(self.__subscribers), 'dropped': sum(self.__dropped.values())}
+
+    def __subscribe(self, writer, subscribes):
+        added = []
+
+        for subscribe in subscribes:
+            code = generate_code(*subscribe[:3])
+
+            if code not in self.__clients[writer]:
+                self.__clients[writer].add(code)
+                subscribers = self.__subscribers.setdefault(code, set())
+
+                if subscribers == set():
+                    added.append(subscribe)
+
+                subscribers.add(writer)
+
+        if added != []:
+            self.__stream.subscribe(added)
+
+    def __unsubscribe(self, writer, subscribes):
+        removed = []
+
+        for subscribe in subscribes:
+            code = generate_code(*subscribe[:3])
+
+            if code in self.__clients[writer]:
+                self.__clients[writer].discard(code)
+                subscribers = self.__subscribers[code]
+                subscribers.discard(writer)
+
+                if subscribers == set():
+                    del self.__subscribers[code]
+                    removed.append(subscribe)
+
+        if removed != []:
+            self.__stream.unsubscribe(removed)
+
+    async def __handle_client(self, reader, writer):
+        self.__clients[writer] = set()
+        self.__dropped[writer] = 0
+
+        try:
+            while True:
+                line = await reader.readline()
+
+                if line == b'':
+                    break
+
+                request = json.loads(line)
+
+                if request.get('op') == 'subscribe':
+                    self.__subscribe(writer, request.get('subscribes', []))
+
+                elif request.get('op') == 'unsubscribe':
+                    self.__unsubscribe(writer, request.get('subscribes', []))
+
+        except ConnectionError as error:
+            logging.debug(f'Gateway client disconnected: {error!r}')
+
+        except ValueError as error:
+            logging.error(f'Gateway client failed: {error!r}')
+
+        finally:
+            codes = self.__clients[writer]
+            self.__unsubscribe(writer, [(code[:5], code[5], code[6:]) for code in list(codes)])
+            del self.__clients[writer]
+            del self.__dropped[writer]
+            writer.close()
+
+    def __send(self, writer, line):
+        if writer.transport.get_write_buffer_size() > self.__max_buffer:
+            self.__dropped[writer] += 1
+
+        else:
+            writer.write(line)
+
+    def __publish(self, msg):
+        if isinstance(msg, StreamEvent):
+            line = (json.dumps({'event': list(msg)}) + '\n').encode()
+
+            for writer in self.__clients.keys():
+                self.__send(writer, line)
+
+            return
+
+        code = self.__stream.msg_code(msg)
+        subscribers = self.__subscribers.get(code)
+
+        if subscribers:
+            line = (json.dumps({'code': code, 'msg': msg.to_dict() if hasattr(msg, 'to_dict') else msg}) + '\n').encode()
+
+            for writer in subscribers:
+                self.__send(writer, line)
+
+    async def start(self):
+        if os.path.exists(self.__path):
+            os.remove(self.__path)
+
+        server = await asyncio.start_unix_server(self.__handle_client, path=self.__path, limit=LINE_LIMIT)
+
+        async with server:
+            await self.__stream.start(self.__publish)
+
+    def run(self):
+        try:
+            asyncio.run(self.start())
+
+        except KeyboardInterrupt:
+            sys.exit()
+
+
+class GatewayClient(object):
+    # Same callback API as StreamCheckpy, fed by a local StreamGateway instead of the koscom websocket.
+    def __init__(self, initial_subscribes: List[Tuple[Union[MarketType, SubType, str]]], path: str = '/tmp/checkpy.sock', record_mode: bool = False):
+        self.__path = path
+        self.__record_mode = record_mode
+        self.__lock = threading.Lock()
+        self.__subscribes = {generate_code(*subscribe[:3]): tuple(str(value) for value in subscribe[:3]) for subscribe in initial_subscribes}
+        self.__code_index = CodeIndex(self.__subscribes.keys())
+        self.__loop = None
+        self.__writer = None
+
+    msg_sub_type = staticmethod(msg_sub_type)
+
+    def msg_code(self, msg) -> str:
+        return self.__code_index.msg_code(msg)
+
+    @staticmethod
+    def __request_lines(op, subscribes) -> bytes:
+        return b''.join((json.dumps({'op': op, 'subscribes': subscribes[i:i + REQUEST_CHUNK]}) + '\n').encode() for i in range(0, len(subscribes), REQUEST_CHUNK))
+
+    def __request(self, op, subscribes):
+        lines = self.__request_lines(op, subscribes)
+
+        if self.__writer is not None and not self.__loop.is_closed():
+            self.__loop.call_soon_threadsafe(self.__writer.write, lines)
+
+    def subscribe(self, subscribes: List[Tuple[Union[MarketType, SubType, str]]]):
+        subscribes = [tuple(str(value) for value in subscribe[:3]) for subscribe in subscribes]
+
+        with self.__lock:
+            for subscribe in subscribes:
+                code = generate_code(*subscribe)
+                self.__subscribes[code] = subscribe
+                self.__code_index.add(code)
+
+        self.__request('subscribe', subscribes)
+
+    def unsubscribe(self, subscribes: List[Tuple[Union[MarketType, SubType, str]]]):
+        subscribes = [tuple(str(value) for value in subscribe[:3]) for subscribe in subscribes]
+
+        with self.__lock:
+            for subscribe in subscribes:
+                code = generate_code(*subscribe)
+                self.__subscribes.pop(code, None)
+                self.__code_index.discard(code)
+
+        self.__request('unsubscribe', subscribes)
+
+    def __decode(self, line):
+        data = json.loads(line)
+        event = data.get('event')
+
+        if event is not None:
+            return StreamEvent(StreamEventType(event[0]), *event[1:])
+
+        msg = data['msg']
+
+        return RECORD_TYPES[self.msg_sub_type(msg)].from_msg(msg) if self.__record_mode else msg
+
+    async def __aiter__(self):
+        self.__loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                reader, self.__writer = await asyncio.open_unix_connection(self.__path, limit=LINE_LIMIT)
+
+                with self.__lock:
+                    subscribes = list(self.__subscribes.values())
+
+                self.__writer.write(self.__request_lines('subscribe', subscribes))
+
+                while True:
+                    line = await reader.readline()
+
+                    if line == b'':
+                        break
+
+                    try:
+                        msg = self.__decode(line)
+
+                    except (KeyError, ValueError) as error:
+                        logging.warning(f'Gateway sent an undecodable line: {error!r}')
+                        continue
+
+                    yield msg
+
+            # readline raises ValueError on a line past LINE_LIMIT; the rest of that line is unusable, so reconnect.
+            except (ConnectionError, FileNotFoundError, ValueError) as error:
+                logging.error(f'Gateway connection failed: {error!r}')
+
+            finally:
+                if self.__writer is not None:
+                    self.__writer.close()
+                    self.__writer = None
+
+            await asyncio.sleep(1)
+
+    async def start(self, callback):
+        is_coroutine = inspect.iscoroutinefunction(callback)
+
+        async for msg in self:
+            if is_coroutine:
+                await callback(msg)
+
+            else:
+                callback(msg)
+
+    def run(self, callback):
+        task = asyncio.get_event_loop()
+
+        try:
+            task.run_until_complete(self.start(callback=callback))
+
+        except KeyboardInterrupt:
+            sys.exit()
+
+
+def main():
+    # Daemon mode: python -m checkpy.gateway --path /tmp/checkpy.sock, with credentials from CHECKPY_USER_ID / CHECKPY_USER_KEY.
+    parser = argparse.ArgumentParser(description='Serve one koscom stream to local checkpy clients')
+    parser.add_argument('--path', default='/tmp/checkpy.sock')
+    parser.add_argument('--max-buffer', type=int, default=4 * 2 ** 20)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    StreamGateway(os.environ['CHECKPY_USER_ID'], os.environ['CHECKPY_USER_KEY'], path=args.path, max_buffer=args.max_buffer).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import json
+import os
+import threading
+import pandas as pd
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+
+class HistCache(object):
+    DAY_END_POINTS = ('intra_date', 'tick_date')
+    RANGE_END_POINTS = ('hist_info', 'term_hist_info')
+    TIMEZONE = ZoneInfo('Asia/Seoul')
+
+    def __init__(self, cache_dir: str):
+        try:
+            import pyarrow
+
+        except ImportError:
+            raise ImportError('pyarrow is required to use the on-disk history cache')
+
+        self.__cache_dir = cache_dir
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def is_cacheable(end_point: str) -> bool:
+        return end_point.rsplit('/', 1)[-1] in HistCache.DAY_END_POINTS + HistCache.RANGE_END_POINTS
+
+    @staticmethod
+    def __to_date(value: str) -> date:
+        return datetime.strptime(value, '%Y%m%d').date()
+
+    @staticmethod
+    def __to_str(value: date) -> str:
+        return value.strftime('%Y%m%d')
+
+    def __today(self) -> date:
+        return datetime.now(HistCache.TIMEZONE).date()
+
+    def __path(self, end_point, code, name):
+        return os.path.join(self.__cache_dir, end_point.strip('/').replace('/', '_'), code, name)
+
+    @staticmethod
+    def __read(path):
+        return pd.read_parquet(path) if os.path.exists(path) else None
+
+    @staticmethod
+    def __write(path, df):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(f'{path}.tmp')
+        os.replace(f'{path}.tmp', path)
+
+    @staticmethod
+    def __write_empty(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(f'{path}.empty', 'w'):
+            pass
+
+    @staticmethod
+    def __read_coverage(path):
+        if os.path.exists(path):
+            with open(path) as f:
+                return [(HistCache.__to_date(start), HistCache.__to_date(end)) for start, end in json.load(f)]
+
+        return []
+
+    @staticmethod
+    def __write_coverage(path, coverage):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump([[HistCache.__to_str(start), HistCache.__to_str(end)] for start, end in coverage], f)
+
+        os.replace(f'{path}.tmp', path)
+
+    @staticmethod
+    def __merge_coverage(coverage):
+        merged = []
+
+        for start, end in sorted(coverage):
+            if merged != [] and start <= merged[-1][1] + timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+
+            else:
+                merged.append((start, end))
+
+        return merged
+
+    @staticmethod
+    def __missing_segments(start, end, coverage):
+        segments = []
+
+        for covered_start, covered_end in coverage:
+            if covered_end < start or covered_start > end:
+                continue
+
+            if covered_start > start:
+                segments.append((start, covered_start - timedelta(days=1)))
+
+            start = max(start, covered_end + timedelta(days=1))
+
+        if start <= end:
+            segments.append((start, end))
+
+        return segments
+
+    @staticmethod
+    def __concat(dfs):
+        dfs = [df for df in dfs if df is not None and not df.empty]
+
+        if dfs == []:
+            return
+
+        df = pd.concat(dfs)
+        df = df[~df.index.duplicated(keep='last')]
+
+        return df.sort_index()
+
+    def fetch(self, end_point, payload, fetch):
+        if end_point.rsplit('/', 1)[-1] in HistCache.DAY_END_POINTS:
+            return self.__fetch_day(end_point, payload, fetch)
+
+        elif payload.get('term', 'daily') == 'daily':
+            return self.__fetch_range(end_point, payload, fetch)
+
+        else:
+            return self.__fetch_term(end_point, payload, fetch)
+
+    def __fetch_closed(self, path, payload, fetch):
+        # A closed day without rows (a holiday, or no trades) leaves an empty marker, so it is not fetched again on every run.
+        if os.path.exists(f'{path}.empty'):
+            return
+
+        df = self.__read(path)
+
+        if df is None:
+            success, df = fetch(payload)
+
+            if success:
+                with self.__lock:
+                    if df is not None:
+                        self.__write(path, df)
+
+                    else:
+                        self.__write_empty(path)
+
+        return df
+
+    def __fetch_day(self, end_point, payload, fetch):
+        if self.__to_date(payload['edate']) >= self.__today():
+            return fetch(payload)[1]
+
+        return self.__fetch_closed(self.__path(end_point, payload['jcode'], f"{payload['edate']}.parquet"), payload, fetch)
+
+    def __fetch_term(self, end_point, payload, fetch):
+        # Weekly or longer bars depend on the whole requested window, so they are only cached per exact closed range.
+        if self.__to_date(payload['edate']) >= self.__today():
+            return fetch(payload)[1]
+
+        return self.__fetch_closed(self.__path(end_point, payload['jcode'], f"{payload['term']}_{payload['sdate']}_{payload['edate']}.parquet"), payload, fetch)
+
+    def __fetch_range(self, end_point, payload, fetch):
+        start, end = self.__to_date(payload['sdate']), self.__to_date(payload['edate'])
+        closed_end = min(end, self.__today() - timedelta(days=1))
+        data_path = self.__path(end_point, payload['jcode'], 'data.parquet')
+        coverage_path = self.__path(end_point, payload['jcode'], 'coverage.json')
+
+        with self.__lock:
+            coverage = self.__read_coverage(coverage_path)
+
+        fetched = []
+
+        for segment_start, segment_end in self.__missing_segments(start, closed_end, coverage):
+            success, df = fetch({**payload, 'sdate': self.__to_str(segment_start), 'edate': self.__to_str(segment_end)})
+
+            if success:
+                fetched.append(df)
+                coverage.append((segment_start, segment_end))
+
+        with self.__lock:
+            stored = self.__read(data_path)
+
+            if fetched != []:
+                stored = self.__concat([stored] + fetched)
+
+                if stored is not None:
+                    self.__write(data_path, stored)
+
+                self.__write_coverage(coverage_path, self.__merge_coverage(coverage + self.__read_coverage(coverage_path)))
+
+        live = fetch({**payload, 'sdate': self.__to_str(max(start, closed_end + timedelta(days=1)))})[1] if end > closed_end else None
+
+        if stored is not None:
+            stored = stored[(stored.index >= pd.Timestamp(start, tz=stored.index.tz)) & (stored.index < pd.Timestamp(closed_end + timedelta(days=1), tz=stored.index.tz))]
+
+        return self.__concat([stored, live])
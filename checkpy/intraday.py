@@ -0,0 +1,155 @@
+import numpy as np
+
+from .checkenum import OutputType
+from .codes import require_sync_client
+from .decode import Decoder
+from .fieldmap import load_field_map
+
+
+class IntradayPoller(object):
+    # Polls a today endpoint (get_*_kline_data_today_10s, get_*_tick_info) per code. The server always returns the whole
+    # session, so rows up to the last timestamp seen for the code are dropped from the raw response before decoding, and only
+    # the new rows are parsed and appended to the code's array, which grows by doubling.
+    DATE_NAMES = ('INTRA_DATE',)
+    TIME_NAMES = ('INTRA_TIME', 'TR_TIME')
+
+    def __init__(self, rest_client, method: str, output: str = OutputType.PANDAS, hold_newest: bool = False):
+        # The row filter is thread-local and AsyncRestCheckpy decodes on its executor threads, so only the blocking client works.
+        require_sync_client(rest_client, 'IntradayPoller')
+
+        self.__client = rest_client
+        self.__method = getattr(rest_client, method)
+        self.__output = OutputType(output)
+        # The newest 10s bar is still forming while the session runs; hold_newest keeps rows back until a later timestamp shows up.
+        self.__hold_newest = hold_newest
+        self.__field_map = load_field_map()
+        self.__stamp_keys = {}
+        self.__last = {}
+        self.__buffers = {}
+
+    def __get_stamp_keys(self, row) -> tuple:
+        layout = tuple(row.keys())
+        keys = self.__stamp_keys.get(layout)
+
+        if keys is None:
+            names = {self.__field_map.get(key): key for key in reversed(layout)}
+            time_keys = [names[name] for name in IntradayPoller.TIME_NAMES if name in names]
+
+            if time_keys == []:
+                raise ValueError(f'{self.__method.__name__} rows carry no time field')
+
+            keys = self.__stamp_keys[layout] = tuple(names[name] for name in IntradayPoller.DATE_NAMES if name in names) + (time_keys[0],)
+
+        return keys
+
+    @staticmethod
+    def __stamp(row, keys) -> tuple:
+        try:
+            return tuple(float(row[key]) for key in keys)
+
+        except (KeyError, TypeError, ValueError):
+            return (float('-inf'),)
+
+    def __select(self, code, results) -> list:
+        # Walks from the newest row back to the last seen timestamp, so the cost follows the number of new rows. Rows sharing
+        # the last seen timestamp are new only past the count already taken.
+        keys = self.__get_stamp_keys(results[0])
+        last, seen = self.__last.get(code, (None, 0))
+        order = range(len(results) - 1, -1, -1) if self.__stamp(results[0], keys) <= self.__stamp(results[-1], keys) else range(len(results))
+        position = 0
+
+        if self.__hold_newest:
+            newest = self.__stamp(results[order[0]], keys)
+
+            while position < len(order) and self.__stamp(results[order[position]], keys) == newest:
+                position += 1
+
+        fresh, equal, top, at_top = [], [], None, 0
+
+        for i in order[position:]:
+            row = results[i]
+            stamp = self.__stamp(row, keys)
+
+            if last is not None and stamp < last:
+                break
+
+            if last is not None and stamp == last:
+                equal.append(row)
+                continue
+
+            if top is None:
+                top = stamp
+
+            at_top += stamp == top
+            fresh.append(row)
+
+        fresh.extend(equal[:max(len(equal) - seen, 0)])
+
+        if top is not None:
+            self.__last[code] = (top, at_top)
+
+        elif last is not None:
+            self.__last[code] = (last, max(seen, len(equal)))
+
+        fresh.reverse()
+
+        return fresh
+
+    def __append(self, code, part):
+        buffer, size = self.__buffers.get(code, (None, 0))
+
+        if buffer is None or size + len(part) > len(buffer):
+            grown = np.empty(max(2 * (size + len(part)), 1024), dtype=part.dtype)
+
+            if buffer is not None:
+                grown[:size] = buffer[:size]
+
+            buffer = grown
+
+        buffer[size:size + len(part)] = part
+        self.__buffers[code] = (buffer, size + len(part))
+
+    def __convert(self, array):
+        if self.__output == OutputType.NUMPY:
+            return array
+
+        import pandas as pd
+
+        names = array.dtype.names
+        index = Decoder.to_datetime_index(array['TIME']) if 'TIME' in names else None
+        df = pd.DataFrame({name: array[name] for name in names if name != 'TIME'}, index=index)
+
+        return Decoder.from_frame(df, output=self.__output)
+
+    def poll(self, code: str):
+        # New rows of the code since the previous poll, or None when there are none.
+        with self.__client._row_filter(lambda results: self.__select(code, results)):
+            part = self.__method(code, output=OutputType.NUMPY)
+
+        if part is None or len(part) == 0:
+            return
+
+        self.__append(code, part)
+
+        return self.__convert(part)
+
+    def poll_all(self, codes: list) -> dict:
+        return {code: self.poll(code) for code in codes}
+
+    def frame(self, code: str):
+        # Every row of the code polled so far; with NUMPY output this is a view into the poller's buffer.
+        buffer, size = self.__buffers.get(code, (None, 0))
+
+        return self.__convert(buffer[:size]) if buffer is not None else None
+
+    def last(self, code: str) -> tuple:
+        return self.__last.get(code, (None, 0))[0]
+
+    def reset(self, code: str = None):
+        if code is None:
+            self.__last.clear()
+            self.__buffers.clear()
+
+        else:
+            self.__last.pop(code, None)
+            self.__buffers.pop(code, None)
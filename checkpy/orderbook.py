@@ -0,0 +1,162 @@
+import numpy as np
+
+from .checkenum import OutputType, SubType
+from .codes import market_methods, require_sync_client
+from .records import StreamEvent, to_float
+
+
+class OrderBook(object):
+    # Fixed-size level arrays updated in place. Depth is a running sum of quantities refreshed into a preallocated buffer
+    # on the first read after an update, so derived values read a handful of elements and allocate nothing.
+    def __init__(self, code: str, levels: int = 10):
+        self.code = code
+        self.levels = levels
+        self.tr_time = None
+        self.updates = 0
+        # Rows are bid prices, ask prices, bid quantities and ask quantities, so a full message is stored with one assignment.
+        self.__data = np.zeros((4, levels))
+        self.__data[:2] = np.nan
+        self.__flat = self.__data.reshape(-1)
+        self.__depth = np.zeros((2, levels))
+        self.__stale = False
+        self.bid_prices, self.ask_prices, self.bid_quantities, self.ask_quantities = self.__data
+        self.__bid_depth, self.__ask_depth = self.__depth
+        self.__keys = [f'{name}{level}{suffix}' for name, suffix in [('BID', ''), ('ASK', ''), ('BID', '_Q'), ('ASK', '_Q')] for level in range(1, levels + 1)]
+
+    def update(self, msg) -> bool:
+        # Works on dicts and records alike; levels missing from the message keep their previous value.
+        values = [msg.get(key) for key in self.__keys]
+        changed = True
+
+        try:
+            if None in values:
+                raise ValueError
+
+            self.__flat[:] = values
+
+        except (TypeError, ValueError):
+            changed = False
+
+            # Unparseable prices become NaN like empty ones, and quantities 0 so the depth sums stay usable.
+            for i, value in enumerate(values):
+                if value is not None:
+                    value = to_float(value)
+                    self.__flat[i] = value if value == value or i < 2 * self.levels else 0.0
+                    changed = True
+
+        if changed:
+            self.__stale = True
+            self.tr_time = msg.get('TR_TIME', self.tr_time)
+            self.updates += 1
+
+        return changed
+
+    @property
+    def best_bid(self) -> float:
+        return float(self.bid_prices[0])
+
+    @property
+    def best_ask(self) -> float:
+        return float(self.ask_prices[0])
+
+    @property
+    def mid(self) -> float:
+        return (float(self.bid_prices[0]) + float(self.ask_prices[0])) / 2
+
+    @property
+    def spread(self) -> float:
+        return float(self.ask_prices[0]) - float(self.bid_prices[0])
+
+    @property
+    def microprice(self) -> float:
+        # Top of book prices weighted by the opposite side's quantity, so the price leans towards the thinner side.
+        bid_quantity, ask_quantity = float(self.bid_quantities[0]), float(self.ask_quantities[0])
+
+        if bid_quantity + ask_quantity == 0:
+            return self.mid
+
+        return (float(self.bid_prices[0]) * ask_quantity + float(self.ask_prices[0]) * bid_quantity) / (bid_quantity + ask_quantity)
+
+    def depth(self, levels: int = None) -> tuple:
+        level = (levels or self.levels) - 1
+
+        if self.__stale:
+            np.cumsum(self.__data[2:], axis=1, out=self.__depth)
+            self.__stale = False
+
+        return float(self.__bid_depth[level]), float(self.__ask_depth[level])
+
+    def imbalance(self, levels: int = None) -> float:
+        # (bid - ask) / (bid + ask) over the first levels of quantity, from -1 (all asks) to 1 (all bids).
+        bid_depth, ask_depth = self.depth(levels)
+
+        return (bid_depth - ask_depth) / (bid_depth + ask_depth) if bid_depth + ask_depth > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {'code': self.code, 'tr_time': self.tr_time, 'bid_prices': self.bid_prices.tolist(), 'bid_quantities': self.bid_quantities.tolist(), 'ask_prices': self.ask_prices.tolist(), 'ask_quantities': self.ask_quantities.tolist()}
+
+    def __repr__(self):
+        return f'OrderBook({self.code}, bid={self.best_bid}x{float(self.bid_quantities[0])}, ask={self.best_ask}x{float(self.ask_quantities[0])}, updates={self.updates})'
+
+
+class OrderBookStore(object):
+    # One OrderBook per ORDERBOOK subscribe code. Callable, so it can be passed straight to StreamCheckpy as the callback.
+    ORDERBOOK_METHODS = market_methods('orderbook_infos')
+
+    def __init__(self, stream, levels: int = 10):
+        self.__stream = stream
+        self.__levels = levels
+        self.__books = {}
+
+    def __call__(self, msg):
+        self.update(msg)
+
+    def __getitem__(self, code) -> OrderBook:
+        return self.__books[code]
+
+    def __contains__(self, code):
+        return code in self.__books
+
+    def get(self, code, default=None) -> OrderBook:
+        return self.__books.get(code, default)
+
+    def codes(self) -> list:
+        return list(self.__books.keys())
+
+    def book(self, code) -> OrderBook:
+        book = self.__books.get(code)
+
+        if book is None:
+            book = self.__books[code] = OrderBook(code, self.__levels)
+
+        return book
+
+    def update(self, msg):
+        if isinstance(msg, StreamEvent) or self.__stream.msg_sub_type(msg) != SubType.ORDERBOOK:
+            return
+
+        self.book(self.__stream.msg_code(msg)).update(msg)
+
+    @staticmethod
+    def fetch_snapshots(rest_client, codes) -> dict:
+        # Groups subscribe codes by market and fetches each group with one *_orderbook_infos call.
+        require_sync_client(rest_client, 'OrderBookStore')
+        markets = {}
+
+        for code in codes:
+            if code[5] == SubType.ORDERBOOK and code[:5] in OrderBookStore.ORDERBOOK_METHODS:
+                markets.setdefault(code[:5], []).append(code[6:])
+
+        snapshots = {}
+
+        for market_type, tickers in markets.items():
+            rows = getattr(rest_client, OrderBookStore.ORDERBOOK_METHODS[market_type])(tickers, output=OutputType.RAW) or []
+
+            for row in rows:
+                snapshots[f'{market_type}{SubType.ORDERBOOK}{row.get("ABBV_CODE")}'] = row
+
+        return snapshots
+
+    def seed(self, rest_client, codes=None):
+        for code, row in self.fetch_snapshots(rest_client, codes if codes is not None else self.__stream.subscribes.keys()).items():
+            self.book(code).update(row)
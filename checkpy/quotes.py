@@ -0,0 +1,158 @@
+import logging
+import threading
+
+from .backfill import TickBackfiller
+from .checkenum import OutputType, StreamEventType, SubType
+from .codes import market_methods, require_sync_client
+from .records import StreamEvent, TickRecord
+
+
+class QuoteTable(object):
+    # One quote dict per ticker, merged from the TRANSACTION and ORDERBOOK feeds. sync() takes a REST snapshot of the
+    # subscribed universe while stream updates are buffered, then replays the buffer on top of it. Updates older than what
+    # a quote already holds for the same feed, by TR_TIME, are dropped, so neither side can move a quote back in time.
+    SNAPSHOT_METHODS = {SubType.TRANSACTION: market_methods('basic_infos'), SubType.ORDERBOOK: market_methods('bbo_infos')}
+
+    def __init__(self, stream, rest_client, resync_on_reconnect: bool = True):
+        require_sync_client(rest_client, 'QuoteTable')
+
+        self.__stream = stream
+        self.__rest_client = rest_client
+        self.__resync_on_reconnect = resync_on_reconnect
+        self.__quotes = {}
+        self.__times = {}
+        self.__lock = threading.Lock()
+        self.__buffer = None
+        self.__sync_thread = None
+
+    def __call__(self, msg):
+        self.update(msg)
+
+    def __getitem__(self, ticker) -> dict:
+        return self.__quotes[ticker]
+
+    def __contains__(self, ticker):
+        return ticker in self.__quotes
+
+    def __len__(self):
+        return len(self.__quotes)
+
+    def get(self, ticker, field: str = None, default=None):
+        quote = self.__quotes.get(ticker)
+
+        if quote is None:
+            return default
+
+        return quote if field is None else quote.get(field, default)
+
+    def quote(self, ticker) -> dict:
+        with self.__lock:
+            quote = self.__quotes.get(ticker)
+
+            return dict(quote) if quote is not None else None
+
+    def tickers(self) -> list:
+        return list(self.__quotes.keys())
+
+    @property
+    def syncing(self) -> bool:
+        return self.__buffer is not None
+
+    @staticmethod
+    def __values(msg) -> dict:
+        # Record slots the message did not carry are None and must not blank out fields taken from the snapshot.
+        return {name: value for name, value in msg.to_dict().items() if value is not None} if isinstance(msg, TickRecord) else msg
+
+    def __apply(self, ticker, sub_type, values):
+        # Snapshots and frames may carry TR_TIME as unpadded strings or numbers, so it is compared as an int.
+        tr_time = TickBackfiller.parse_tr_time(values.get('TR_TIME'))
+        times = self.__times.setdefault(ticker, {})
+
+        if tr_time is not None:
+            if tr_time < times.get(sub_type, tr_time):
+                return
+
+            times[sub_type] = tr_time
+
+        quote = self.__quotes.get(ticker)
+
+        if quote is None:
+            self.__quotes[ticker] = dict(values)
+
+        else:
+            quote.update(values)
+
+    def update(self, msg):
+        if isinstance(msg, StreamEvent):
+            if msg.kind == StreamEventType.RECONNECTED and self.__resync_on_reconnect:
+                self.sync(wait=False)
+
+            return
+
+        with self.__lock:
+            if self.__buffer is not None:
+                self.__buffer.append(msg)
+
+            else:
+                values = self.__values(msg)
+                self.__apply(values.get('ABBV_CODE'), self.__stream.msg_sub_type(msg), values)
+
+    def __fetch(self, codes) -> list:
+        requests = {}
+
+        for code in codes:
+            if code[5] in QuoteTable.SNAPSHOT_METHODS and code[:5] in QuoteTable.SNAPSHOT_METHODS[code[5]]:
+                requests.setdefault((code[:5], SubType(code[5])), []).append(code[6:])
+
+        rows = []
+
+        for (market_type, sub_type), tickers in requests.items():
+            method = QuoteTable.SNAPSHOT_METHODS[sub_type][market_type]
+
+            try:
+                rows.extend((sub_type, row) for row in getattr(self.__rest_client, method)(tickers, output=OutputType.RAW) or [])
+
+            except Exception as error:
+                logging.error(f'Snapshot {method} failed: {error!r}')
+
+        return rows
+
+    def __sync(self, codes):
+        rows = []
+
+        try:
+            rows = self.__fetch(codes)
+
+        finally:
+            with self.__lock:
+                buffer, self.__buffer = self.__buffer, None
+
+                for sub_type, row in rows:
+                    self.__apply(row.get('ABBV_CODE'), sub_type, row)
+
+                # Buffered stream updates keep their arrival order and are only dropped when older than the snapshot.
+                for msg in buffer:
+                    values = self.__values(msg)
+                    self.__apply(values.get('ABBV_CODE'), self.__stream.msg_sub_type(msg), values)
+
+    def sync(self, codes=None, wait: bool = True):
+        with self.__lock:
+            if self.__buffer is not None:
+                return
+
+            self.__buffer = []
+
+        codes = list(codes if codes is not None else self.__stream.subscribes.keys())
+
+        if wait:
+            self.__sync(codes)
+
+        else:
+            self.__sync_thread = threading.Thread(target=self.__sync, args=(codes,), daemon=True)
+            self.__sync_thread.start()
+
+    def to_frame(self):
+        import pandas as pd
+
+        with self.__lock:
+            return pd.DataFrame.from_dict({ticker: dict(quote) for ticker, quote in self.__quotes.items()}, orient='index')
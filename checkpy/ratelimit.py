@@ -0,0 +1,95 @@
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+from .checkenum import RequestPriority
+
+
+class RateLimiter(object):
+    STATE_FORMAT = 'dd'
+
+    def __init__(self, rate: float, burst: int = None, state_path: str = None):
+        self.__rate = rate
+        self.__burst = burst if burst is not None else max(1, int(rate))
+        self.__tokens = float(self.__burst)
+        self.__updated = time.monotonic()
+        self.__state_path = state_path
+        self.__condition = threading.Condition()
+        self.__lanes = {priority: deque() for priority in RequestPriority}
+
+    def __refill(self, tokens, updated, now):
+        return min(float(self.__burst), tokens + (now - updated) * self.__rate)
+
+    def __take_local(self):
+        now = time.monotonic()
+        self.__tokens, self.__updated = self.__refill(self.__tokens, self.__updated, now), now
+
+        if self.__tokens >= 1:
+            self.__tokens -= 1
+
+            return 0.0
+
+        return (1 - self.__tokens) / self.__rate
+
+    def __take_shared(self):
+        # The bucket lives in a small file guarded by flock, so every process using the same state_path shares one budget.
+        import fcntl
+
+        size = struct.calcsize(RateLimiter.STATE_FORMAT)
+        fd = os.open(self.__state_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, size, 0)
+            now = time.time()
+            tokens, updated = struct.unpack(RateLimiter.STATE_FORMAT, data) if len(data) == size else (float(self.__burst), now)
+            tokens = self.__refill(tokens, updated, now)
+            wait = 0.0
+
+            if tokens >= 1:
+                tokens -= 1
+
+            else:
+                wait = (1 - tokens) / self.__rate
+
+            os.pwrite(fd, struct.pack(RateLimiter.STATE_FORMAT, tokens, now), 0)
+
+            return wait
+
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def __is_next(self, ticket, priority):
+        for lane_priority in RequestPriority:
+            lane = self.__lanes[lane_priority]
+
+            if len(lane) > 0:
+                return lane_priority == priority and lane[0] is ticket
+
+        return False
+
+    def acquire(self, priority: RequestPriority = RequestPriority.NORMAL):
+        ticket = object()
+
+        with self.__condition:
+            self.__lanes[priority].append(ticket)
+
+            try:
+                while True:
+                    if self.__is_next(ticket, priority):
+                        wait = self.__take_shared() if self.__state_path is not None else self.__take_local()
+
+                        if wait == 0.0:
+                            return
+
+                    else:
+                        wait = None
+
+                    self.__condition.wait(timeout=wait)
+
+            finally:
+                self.__lanes[priority].remove(ticket)
+                self.__condition.notify_all()
@@ -0,0 +1,123 @@
+from .checkenum import StreamEventType, SubType
+from .fieldmap import load_field_map
+from typing import NamedTuple, Optional, Tuple
+
+
+def to_float(value) -> float:
+    # Numeric columns store anything that does not parse, such as '' or 'N/A', as NaN.
+    try:
+        return float(value)
+
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class TickRecord(object):
+    __slots__ = ()
+    FIELDS = ()
+    SUB_TYPE = None
+    INT_TYPES = ('INT', 'SMALLINT', 'MEDIUMINT', 'BIGINT')
+    STRING_TYPES = ('CHAR', 'VARCHAR')
+
+    @staticmethod
+    def __to_int(value):
+        # INT in Table.xlsx also covers futures and option prices such as 352.45, so only integral values become ints.
+        if type(value) is int:
+            return value
+
+        if isinstance(value, str):
+            try:
+                return int(value)
+
+            except ValueError:
+                pass
+
+        number = float(value)
+
+        return int(number) if number.is_integer() else number
+
+    @staticmethod
+    def __to_float(value):
+        return float(value)
+
+    @classmethod
+    def __get_converters(cls):
+        # Built once per record class from the SQL types of Table.xlsx, keyed by the translated field name.
+        converters = cls.__dict__.get('_converters')
+
+        if converters is None:
+            fields = load_field_map()
+            converters = []
+
+            for name in cls.FIELDS:
+                sql_type = fields.types[fields.codes(name)[0]]
+
+                if sql_type.startswith(TickRecord.STRING_TYPES):
+                    converters.append((name, str))
+
+                elif sql_type.startswith(TickRecord.INT_TYPES):
+                    converters.append((name, TickRecord.__to_int))
+
+                else:
+                    converters.append((name, TickRecord.__to_float))
+
+            cls._converters = converters
+
+        return converters
+
+    @classmethod
+    def from_msg(cls, msg: dict):
+        record = cls.__new__(cls)
+
+        for name, converter in cls.__get_converters():
+            value = msg.get(name)
+
+            try:
+                setattr(record, name, converter(value) if value is not None and value != '' else None)
+
+            except (TypeError, ValueError):
+                setattr(record, name, None)
+
+        return record
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None)
+
+        return default if value is None else value
+
+    def __contains__(self, name):
+        return getattr(self, name, None) is not None
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.FIELDS if getattr(self, name) is not None)})"
+
+
+class TransactionTick(TickRecord):
+    FIELDS = ('ABBV_CODE', 'TR_TIME', 'LAST', 'OPEN', 'HIGH', 'LOW', 'UP_DOWN', 'CHANGE', 'RET', 'TR_VOL', 'VOL', 'AMT', 'ASK1', 'BID1', 'OI')
+    SUB_TYPE = SubType.TRANSACTION
+    __slots__ = FIELDS
+
+
+class OrderbookTick(TickRecord):
+    FIELDS = ('ABBV_CODE', 'TR_TIME') + tuple(f'{side}{level}' for level in range(1, 11) for side in ('ASK', 'BID')) + tuple(f'{side}{level}_Q' for level in range(1, 11) for side in ('ASK', 'BID')) + ('ASK10_Q_SUM', 'BID10_Q_SUM')
+    SUB_TYPE = SubType.ORDERBOOK
+    __slots__ = FIELDS
+
+
+RECORD_TYPES = {SubType.TRANSACTION: TransactionTick, SubType.ORDERBOOK: OrderbookTick}
+
+
+class StreamEvent(NamedTuple):
+    # Connection events delivered through the tick queue when StreamCheckpy(events=True). Times are epoch seconds.
+    kind: StreamEventType
+    time: float
+    codes: Tuple[str, ...] = ()
+    gap_start: Optional[float] = None
+    gap_end: Optional[float] = None
+    detail: object = None
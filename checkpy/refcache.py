@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache(object):
+    DEFAULT_TTLS = {'code_info': 3600.0, 'basic_info': 60.0}
+    UNCACHED_KEYS = ('cust_id', 'auth_key')
+
+    def __init__(self, max_size: int = 256, ttls: dict = None):
+        self.__max_size = max_size
+        self.__ttls = {**TTLCache.DEFAULT_TTLS, **(ttls or {})}
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__saved_seconds = 0.0
+
+    @staticmethod
+    def __end_point_type(end_point: str) -> str:
+        return end_point.rsplit('/', 1)[-1]
+
+    @staticmethod
+    def __generate_key(end_point, payload):
+        return end_point, tuple(sorted((key, value) for key, value in payload.items() if key not in TTLCache.UNCACHED_KEYS))
+
+    @staticmethod
+    def __copy(value):
+        # Arrow tables are immutable, everything else is copied so callers cannot mutate the cached entry; RAW rows are dicts
+        # of their own, so each one is copied as well.
+        if isinstance(value, list):
+            return [dict(row) for row in value]
+
+        return value.copy() if hasattr(value, 'copy') else value
+
+    def is_cacheable(self, end_point: str) -> bool:
+        return self.__ttls.get(self.__end_point_type(end_point), 0) > 0
+
+    def set_ttl(self, end_point_type: str, ttl: float):
+        with self.__lock:
+            self.__ttls[end_point_type] = ttl
+
+    def fetch(self, end_point, payload, fetch):
+        key = self.__generate_key(end_point, payload)
+        now = time.monotonic()
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None and entry[0] > now:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                self.__saved_seconds += entry[2]
+
+                return self.__copy(entry[1])
+
+            self.__misses += 1
+
+        value = fetch()
+        elapsed = time.monotonic() - now
+
+        if value is not None:
+            with self.__lock:
+                self.__entries[key] = (now + self.__ttls.get(self.__end_point_type(end_point), 0), value, elapsed)
+                self.__entries.move_to_end(key)
+
+                while len(self.__entries) > self.__max_size:
+                    self.__entries.popitem(last=False)
+
+            return self.__copy(value)
+
+        return value
+
+    def invalidate(self, end_point: str = None):
+        with self.__lock:
+            if end_point is None:
+                self.__entries.clear()
+
+            else:
+                for key in [key for key in self.__entries.keys() if key[0] == end_point or self.__end_point_type(key[0]) == end_point]:
+                    del self.__entries[key]
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {'hits': self.__hits, 'misses': self.__misses, 'size': len(self.__entries), 'saved_seconds': self.__saved_seconds}
@@ -0,0 +1,151 @@
+import asyncio
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+
+class StreamRecorder(object):
+    # Append-only log of raw frames. Frames are buffered and written as zlib compressed blocks of (receive time, length,
+    # utf-8 frame) records, so a crash loses at most the block being filled. Level 1 is the default as this runs on the receive path.
+    MAGIC = b'CHKPYREC1\n'
+    BLOCK_HEADER = struct.Struct('<II')
+    RECORD_HEADER = struct.Struct('<dI')
+
+    def __init__(self, path: str, block_size: int = 1 << 20, level: int = 1):
+        self.__path = path
+        self.__block_size = block_size
+        self.__level = level
+        self.__buffer = bytearray()
+        self.__lock = threading.Lock()
+        self.__frames = 0
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.__file = open(path, 'ab')
+
+        if is_new:
+            self.__file.write(StreamRecorder.MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def frames(self) -> int:
+        return self.__frames
+
+    def write(self, frame, received: float = None):
+        data = frame.encode() if isinstance(frame, str) else frame
+
+        with self.__lock:
+            self.__buffer += StreamRecorder.RECORD_HEADER.pack(time.time() if received is None else received, len(data))
+            self.__buffer += data
+            self.__frames += 1
+
+            if len(self.__buffer) >= self.__block_size:
+                self.__write_block()
+
+    def __write_block(self):
+        if len(self.__buffer) > 0:
+            block = zlib.compress(bytes(self.__buffer), self.__level)
+            self.__file.write(StreamRecorder.BLOCK_HEADER.pack(len(block), len(self.__buffer)))
+            self.__file.write(block)
+            self.__buffer.clear()
+
+    def flush(self):
+        with self.__lock:
+            self.__write_block()
+            self.__file.flush()
+
+    def close(self):
+        with self.__lock:
+            if not self.__file.closed:
+                self.__write_block()
+                self.__file.close()
+
+
+class StreamLog(object):
+    # Memory-maps a recorded log and yields (receive time, frame) pairs, decompressing one block at a time.
+    def __init__(self, path: str):
+        self.__path = path
+
+    def __iter__(self):
+        with open(self.__path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= len(StreamRecorder.MAGIC):
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if view[:len(StreamRecorder.MAGIC)] != StreamRecorder.MAGIC:
+                    raise ValueError(f'{self.__path} is not a stream log')
+
+                offset = len(StreamRecorder.MAGIC)
+                block_header, record_header = StreamRecorder.BLOCK_HEADER, StreamRecorder.RECORD_HEADER
+
+                # A block cut short by a crash is ignored rather than failing the whole replay.
+                while offset + block_header.size <= len(view):
+                    length, raw_length = block_header.unpack_from(view, offset)
+                    offset += block_header.size
+
+                    if offset + length > len(view):
+                        return
+
+                    block = zlib.decompress(view[offset:offset + length], bufsize=raw_length)
+                    offset += length
+                    position = 0
+
+                    while position < len(block):
+                        received, size = record_header.unpack_from(block, position)
+                        position += record_header.size
+                        yield received, block[position:position + size].decode()
+                        position += size
+
+
+class ReplayConnection(object):
+    # Stands in for a websocket connection: subscribe frames are ignored and recorded frames are yielded by async for.
+    def __init__(self, log: StreamLog, speed: float = None, yield_every: int = 256):
+        self.__log = log
+        self.__speed = speed
+        self.__yield_every = yield_every
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def send(self, message):
+        pass
+
+    async def close(self):
+        pass
+
+    async def __aiter__(self):
+        started, first = time.monotonic(), None
+
+        for count, (received, frame) in enumerate(self.__log):
+            if self.__speed is not None:
+                first = received if first is None else first
+                delay = started + (received - first) / self.__speed - time.monotonic()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            # At max speed the consumer still needs the loop now and then.
+            elif count % self.__yield_every == 0:
+                await asyncio.sleep(0)
+
+            yield frame
+
+
+class ReplaySource(object):
+    # Pass as StreamCheckpy(source=...) to replay a log instead of connecting. speed=1.0 is real time, 10.0 ten times faster
+    # and None as fast as the consumer keeps up. The stream ends once the log is exhausted.
+    def __init__(self, path: str, speed: float = None):
+        self.__log = StreamLog(path)
+        self.__speed = speed
+
+    def connect(self) -> ReplayConnection:
+        return ReplayConnection(self.__log, self.__speed)
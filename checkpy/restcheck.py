@@ -1,8 +1,16 @@
-import json
 import requests
 import logging
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from enum import IntEnum
+from typing import List, NamedTuple
+from .checkenum import OutputType, RequestPriority
+from .decode import Decoder
+from .ratelimit import RateLimiter
+from .refcache import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class TimeSeriesType(IntEnum):
@@ -11,52 +19,171 @@ class TimeSeriesType(IntEnum):
     OTHER = 2
 
 
+class ChunkError(NamedTuple):
+    tickers: List[str]
+    message: str
+
+
 class RestCheckpy(object):
     KLINE_INTERVAL = {'1d': 'daily', '1w': 'weekly', '1q': "quarterly", 'yoy': 'YTD', '1y': "yearly"}
+    REF_CACHE = TTLCache()
+    END_POINT_PRIORITY = {'hoga_info_port': RequestPriority.HIGH, 'hoga_info_port_top': RequestPriority.HIGH, 'hist_info': RequestPriority.LOW, 'term_hist_info': RequestPriority.LOW, 'intra_date': RequestPriority.LOW, 'tick_date': RequestPriority.LOW}
 
-    def __init__(self, user_id, user_key):
+    def __init__(self, user_id, user_key, pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.3, timeout: float = None, rest_base_uri: str = 'https://checkapi.koscom.co.kr', batch_size: int = 100, port_workers: int = 4, cache_dir: str = None, use_ref_cache: bool = False, output: str = OutputType.PANDAS, rate_limiter: RateLimiter = None):
         self.__user_id = user_id
         self.__user_key = user_key
-        self.__rest_base_uri = 'https://checkapi.koscom.co.kr'
+        self.__rest_base_uri = rest_base_uri
+        self.__timeout = timeout
+        self.__session = self.__create_session(pool_size=pool_size, max_retries=max_retries, backoff_factor=backoff_factor)
+        self.__batch_size = batch_size
+        self.__port_executor = ThreadPoolExecutor(max_workers=port_workers, thread_name_prefix='checkpy-port')
+        self.__hist_cache = self.__create_hist_cache(cache_dir) if cache_dir is not None else None
+        self.__use_ref_cache = use_ref_cache
+        self.__output = OutputType(output)
+        self.__rate_limiter = rate_limiter
+        self.__local = threading.local()
+
+        self.__decoder = Decoder.shared()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.__port_executor.shutdown(wait=False, cancel_futures=True)
+        self.__session.close()
+
+    @staticmethod
+    def __create_session(pool_size, max_retries, backoff_factor):
+        # Every endpoint is a read-only POST, so it is safe to retry them like idempotent calls.
+        retry = Retry(total=max_retries, backoff_factor=backoff_factor, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset(['GET', 'POST']), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.headers.update({'Connection': 'keep-alive'})
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    @staticmethod
+    def __create_hist_cache(cache_dir):
+        # Imported here so that pandas is only loaded once something actually builds a DataFrame.
+        from .histcache import HistCache
+
+        return HistCache(cache_dir)
+
+    def _post(self, end_point, payload):
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire(RestCheckpy.END_POINT_PRIORITY.get(end_point.rsplit('/', 1)[-1], RequestPriority.NORMAL))
+
+        return self.__session.post(f'{self.__rest_base_uri}{end_point}', data=payload, timeout=self.__timeout).json()
+
+    @contextmanager
+    def _row_filter(self, select):
+        # Calls made on this thread inside the block pass their raw result rows through select before anything is decoded.
+        previous = getattr(self.__local, 'select', None)
+        self.__local.select = select
+
+        try:
+            yield
+
+        finally:
+            self.__local.select = previous
+
+    def _fetch_data(self, end_point, payload, is_time_series: TimeSeriesType, output: str = None):
+        output = OutputType(output or self.__output)
+
+        if self.__use_ref_cache and RestCheckpy.REF_CACHE.is_cacheable(end_point) and getattr(self.__local, 'select', None) is None:
+            return RestCheckpy.REF_CACHE.fetch(end_point, {**payload, 'output': output}, fetch=lambda: self._parse_resp(self._post(end_point=end_point, payload=payload), is_time_series=is_time_series, output=output))
+
+        # The cache stores decoded frames, which cannot give back the untouched rows RAW promises, so RAW always goes to the server.
+        if self.__hist_cache is not None and output != OutputType.RAW and self.__hist_cache.is_cacheable(end_point):
+            df = self.__hist_cache.fetch(end_point, payload, fetch=lambda segment: self.__fetch_segment(end_point, segment, is_time_series))
+
+            return Decoder.from_frame(df, output=output) if df is not None else None
+
+        return self._parse_resp(self._post(end_point=end_point, payload=payload), is_time_series=is_time_series, output=output)
+
+    def __fetch_segment(self, end_point, payload, is_time_series: TimeSeriesType):
+        resp = self._post(end_point=end_point, payload=payload)
+
+        return resp.get('success') is True, self._parse_resp(resp, is_time_series=is_time_series, output=OutputType.PANDAS)
+
+    def _chunk_tickers(self, tickers: list):
+        return [tickers[i:i + self.__batch_size] for i in range(0, len(tickers), self.__batch_size)]
+
+    def _fetch_chunk(self, end_point, payload, tickers: list, is_time_series: TimeSeriesType, output: str = None):
+        try:
+            resp = self._post(end_point=end_point, payload={**payload, 'codelist': ','.join(tickers)})
+
+        except (requests.RequestException, ValueError) as RequestError:
+            return None, ChunkError(tickers=tickers, message=str(RequestError))
+
+        if resp.get('success') is True:
+            return self._parse_resp(resp, is_time_series=is_time_series, output=output), None
+
+        else:
+            return None, ChunkError(tickers=tickers, message=resp.get('message'))
+
+    def _merge_chunks(self, results, is_time_series: TimeSeriesType, output: str = None):
+        output = OutputType(output or self.__output)
+        parts = [part for part, _ in results if part is not None]
+        errors = [error for _, error in results if error is not None]
+
+        for error in errors:
+            logging.warning(f'Fetch chunk failed. tickers: {error.tickers[0]}..{error.tickers[-1]} ({len(error.tickers)}) msg: {error.message}')
+
+        if parts == []:
+            return
+
+        merged = Decoder.concat(parts, output=output, is_time_series=is_time_series != TimeSeriesType.NOT_TS)
+
+        if output == OutputType.PANDAS:
+            merged.attrs['chunk_errors'] = errors
 
-        with open('checkpy/translate.json') as f:
-            self.__translate = json.load(f)
+        return merged
 
-    def __convert_columns(self, columns):
-        return [self.__translate.get(column) for column in columns]
+    def _fetch_port_data(self, end_point, payload, tickers: list, is_time_series: TimeSeriesType, output: str = None):
+        chunks = self._chunk_tickers(tickers)
 
-    def __fetch_data(self, end_point, payload, is_time_series: TimeSeriesType):
-        resp = requests.post(f'{self.__rest_base_uri}{end_point}', data=payload).json()
+        if len(chunks) == 1:
+            results = [self._fetch_chunk(end_point, payload, chunks[0], is_time_series, output)]
+
+        else:
+            results = list(self.__port_executor.map(lambda chunk: self._fetch_chunk(end_point, payload, chunk, is_time_series, output), chunks))
+
+        return self._merge_chunks(results, is_time_series=is_time_series, output=output)
+
+    def _parse_resp(self, resp, is_time_series: TimeSeriesType, output: str = None):
+        output = OutputType(output or self.__output)
 
         if resp.get('success') is True:
             results = resp.get('results')
+            select = getattr(self.__local, 'select', None)
+
+            if select is not None and results:
+                results = select(results)
 
             if results != []:
-                df = pd.DataFrame(results)
-                df.columns = self.__convert_columns(df.columns)
+                if output == OutputType.RAW:
+                    return self.__decoder.translate(results)
 
-                if is_time_series == TimeSeriesType.INTRA_DAY:
-                    try:
-                        df['TIME'] = pd.to_datetime(df['INTRA_DATE'].astype(str) + df['INTRA_TIME'].astype(str).str.zfill(8), format='%Y%m%d%H%M%S%f')
-                        df.set_index(df['TIME'], inplace=True, drop=True)
-                        df.sort_index(inplace=True)
-                        
-                    except KeyError:
-                        pass
+                columns = self.__decoder.decode(results)
 
-                    df.drop(columns=['TIME', 'INTRA_DATE', 'INTRA_TIME'], errors='ignore', inplace=True)
+                if is_time_series == TimeSeriesType.INTRA_DAY:
+                    dates, times = columns.pop('INTRA_DATE', None), columns.pop('INTRA_TIME', None)
+                    index = Decoder.to_epoch_ns(dates, times) if dates is not None and times is not None else None
 
-                
                 elif is_time_series == TimeSeriesType.OTHER:
-                    df['TIME'] = pd.to_datetime(df['DATE'].astype(str), format='%Y%m%d')
-                    df.set_index(df['TIME'], inplace=True, drop=True)
-                    df.sort_index(inplace=True)
-                    df.drop(columns=['TIME', 'DATE'], errors='ignore', inplace=True)
+                    index = Decoder.to_epoch_ns(columns.pop('DATE'))
 
                 else:
-                    pass
+                    index = None
 
-                return df.loc[:, df.columns.notna()].astype('float', errors='ignore')
+                return Decoder.build(columns, index, output=output)
 
             else:
                 return
@@ -66,733 +193,733 @@ class RestCheckpy(object):
 
             return
     
-    def get_kospi_stock_info(self):
+    def get_kospi_stock_info(self, output: str = None):
         end_point = '/stock/m001/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
 
-    def get_kospi_stock_basic_infos(self, tickers: list):
+    def get_kospi_stock_basic_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m001/basic_info_all_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_kospi_stock_investor_infos(self, tickers: list):
+    def get_kospi_stock_investor_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m001/invest_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
 
-    def get_kospi_stock_orderbook_infos(self, tickers: list):
+    def get_kospi_stock_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m001/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kospi_stock_bbo_infos(self, tickers: list):
+    def get_kospi_stock_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m001/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kospi_stock_rank_infos(self, index_code: str, criteria_code: str):
+    def get_kospi_stock_rank_infos(self, index_code: str, criteria_code: str, output: str = None):
         end_point = '/stock/m001/rank'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'up_code': index_code, 'criteria_code': criteria_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_kospi_stock_daily_info(self, ticker: str, start: str, end: str):
+    def get_kospi_stock_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/stock/m001/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
     
-    def get_kospi_stock_tick_data(self, ticker: str, date: str):
+    def get_kospi_stock_tick_data(self, ticker: str, date: str, output: str = None):
         end_point = '/stock/m001/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kospi_stock_kline_data_today_10s(self, ticker: str):
+    def get_kospi_stock_kline_data_today_10s(self, ticker: str, output: str = None):
         end_point = '/stock/m001/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_kospi_stock_kline_data_intra_1m(self, ticker: str, date: str):
+    def get_kospi_stock_kline_data_intra_1m(self, ticker: str, date: str, output: str = None):
         end_point = '/stock/m001/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kospi_stock_kline_data(self, ticker: str, interval: str, start: str, end: str):
+    def get_kospi_stock_kline_data(self, ticker: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/stock/m001/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
         
-    def get_kospi_index_infos(self):
+    def get_kospi_index_infos(self, output: str = None):
         end_point = '/stock/m002/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
 
-    def get_kospi_index_basic_info(self, index_code: str):
+    def get_kospi_index_basic_info(self, index_code: str, output: str = None):
         end_point = '/stock/m002/basic_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
 
-    def get_kospi_index_daily_info(self, index_code: str, start: str, end: str):
+    def get_kospi_index_daily_info(self, index_code: str, start: str, end: str, output: str = None):
         end_point = '/stock/m002/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
     
-    def get_kospi_index_tick_info(self, index_code: str):
+    def get_kospi_index_tick_info(self, index_code: str, output: str = None):
         end_point = '/stock/m002/tick_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_kospi_index_kline_data_today_10s(self, index_code: str):
+    def get_kospi_index_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/stock/m002/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_kospi_index_kline_data_intra_1m(self, index_code: str, date: str):
+    def get_kospi_index_kline_data_intra_1m(self, index_code: str, date: str, output: str = None):
         end_point = '/stock/m002/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kospi_index_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_kospi_index_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/stock/m002/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
 
-    def get_kosdaq_stock_info(self):
+    def get_kosdaq_stock_info(self, output: str = None):
         end_point = '/stock/m003/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
 
-    def get_kosdaq_stock_basic_infos(self, tickers: list):
+    def get_kosdaq_stock_basic_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m003/basic_info_all_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_kosdaq_stock_investor_infos(self, tickers: list):
+    def get_kosdaq_stock_investor_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m003/invest_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
 
-    def get_kosdaq_stock_orderbook_infos(self, tickers: list):
+    def get_kosdaq_stock_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m003/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kosdaq_stock_bbo_infos(self, tickers: list):
+    def get_kosdaq_stock_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/stock/m003/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kosdaq_stock_rank_infos(self, index_code: str, criteria_code: str):
+    def get_kosdaq_stock_rank_infos(self, index_code: str, criteria_code: str, output: str = None):
         end_point = '/stock/m003/rank'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'up_code': index_code, 'criteria_code': criteria_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_kosdaq_stock_daily_info(self, ticker: str, start: str, end: str):
+    def get_kosdaq_stock_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/stock/m003/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
     
-    def get_kosdaq_stock_tick_data(self, ticker: str, date: str):
+    def get_kosdaq_stock_tick_data(self, ticker: str, date: str, output: str = None):
         end_point = '/stock/m003/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kosdaq_stock_kline_data_today_10s(self, ticker: str):
+    def get_kosdaq_stock_kline_data_today_10s(self, ticker: str, output: str = None):
         end_point = '/stock/m003/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kosdaq_stock_kline_data_intra_1m(self, ticker: str, date: str):
+    def get_kosdaq_stock_kline_data_intra_1m(self, ticker: str, date: str, output: str = None):
         end_point = '/stock/m003/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kosdaq_stock_kline_data(self, ticker: str, interval: str, start: str, end: str):
+    def get_kosdaq_stock_kline_data(self, ticker: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/stock/m003/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
         
-    def get_kosdaq_index_infos(self):
+    def get_kosdaq_index_infos(self, output: str = None):
         end_point = '/stock/m004/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_kosdaq_index_basic_info(self, index_code):
+    def get_kosdaq_index_basic_info(self, index_code, output: str = None):
         end_point = '/stock/m004/basic_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
 
-    def get_kosdaq_index_daily_info(self, index_code: str, start: str, end: str):
+    def get_kosdaq_index_daily_info(self, index_code: str, start: str, end: str, output: str = None):
         end_point = '/stock/m004/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
     
-    def get_kosdaq_index_tick_info(self, index_code: str):
+    def get_kosdaq_index_tick_info(self, index_code: str, output: str = None):
         end_point = '/stock/m004/tick_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_kosdaq_index_kline_data_today_10s(self, index_code: str):
+    def get_kosdaq_index_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/stock/m004/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_kosdaq_index_kline_data_intra_1m(self, index_code: str, date: str):
+    def get_kosdaq_index_kline_data_intra_1m(self, index_code: str, date: str, output: str = None):
         end_point = '/stock/m004/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kosdaq_index_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_kosdaq_index_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/stock/m004/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
     
-    def get_sector_index_infos(self):
+    def get_sector_index_infos(self, output: str = None):
         end_point = '/stock/m167/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_sector_index_basic_info(self, index_code: str):
+    def get_sector_index_basic_info(self, index_code: str, output: str = None):
         end_point = '/stock/m167/basic_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_sector_index_daily_info(self, index_code: str, start: str, end: str):
+    def get_sector_index_daily_info(self, index_code: str, start: str, end: str, output: str = None):
         end_point = '/stock/m167/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
 
-    def get_sector_index_tick_info(self, index_code: str):
+    def get_sector_index_tick_info(self, index_code: str, output: str = None):
         end_point = '/stock/m167/tick_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_sector_index_kline_data_today_10s(self, index_code: str):
+    def get_sector_index_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/stock/m167/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_sector_index_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_sector_index_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/stock/m167/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
     
-    def get_other_index_infos(self):
+    def get_other_index_infos(self, output: str = None):
         end_point = '/stock/m168/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_other_index_basic_info(self, index_code):
+    def get_other_index_basic_info(self, index_code, output: str = None):
         end_point = '/stock/m168/basic_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_other_index_daily_info(self, index_code: str, start: str, end: str):
+    def get_other_index_daily_info(self, index_code: str, start: str, end: str, output: str = None):
         end_point = '/stock/m168/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
 
-    def get_other_index_tick_info(self, index_code: str):
+    def get_other_index_tick_info(self, index_code: str, output: str = None):
         end_point = '/stock/m168/tick_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_other_index_kline_data_today_10s(self, index_code: str):
+    def get_other_index_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/stock/m168/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_other_index_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_other_index_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/stock/m168/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
     
-    def get_k200_futures_code_info(self):
+    def get_k200_futures_code_info(self, output: str = None):
         end_point = '/future/m005/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_futures_basic_infos(self, tickers: list):
+    def get_k200_futures_basic_infos(self, tickers: list, output: str = None):
         end_point = '/future/m005/basic_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_futures_orderbook_infos(self, tickers: list):
+    def get_k200_futures_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/future/m005/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_futures_bbo_infos(self, tickers: list):
+    def get_k200_futures_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/future/m005/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_futures_daily_info(self, ticker: str, start: str, end: str):
+    def get_k200_futures_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/future/m005/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)  
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)  
     
-    def get_k200_futures_tick_info(self, ticker: str, date: str):
+    def get_k200_futures_tick_info(self, ticker: str, date: str, output: str = None):
         end_point = '/futures/m005/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_k200_futures_kline_data_today_10s(self, index_code: str):
+    def get_k200_futures_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/future/m005/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_k200_futures_kline_data_intra_10s(self, index_code: str, date: str):
+    def get_k200_futures_kline_data_intra_10s(self, index_code: str, date: str, output: str = None):
         end_point = '/future/m005/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_futures_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_k200_futures_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/future/m005/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
 
-    def get_kq150_futures_code_info(self):
+    def get_kq150_futures_code_info(self, output: str = None):
         end_point = '/future/m067/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_kq150_futures_basic_infos(self, tickers: list):
+    def get_kq150_futures_basic_infos(self, tickers: list, output: str = None):
         end_point = '/future/m067/basic_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_kq150_futures_orderbook_infos(self, tickers: list):
+    def get_kq150_futures_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/future/m067/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kq150_futures_bbo_infos(self, tickers: list):
+    def get_kq150_futures_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/future/m067/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kq150_futures_daily_info(self, ticker: str, start: str, end: str):
+    def get_kq150_futures_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/future/m067/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)  
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)  
     
-    def get_kq150_futures_tick_info(self, ticker: str, date: str):
+    def get_kq150_futures_tick_info(self, ticker: str, date: str, output: str = None):
         end_point = 'futures/m067/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_kq150_futures_kline_data_today_10s(self, index_code: str):
+    def get_kq150_futures_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/future/m067/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_kq150_futures_kline_data_intra_10s(self, index_code: str, date: str):
+    def get_kq150_futures_kline_data_intra_10s(self, index_code: str, date: str, output: str = None):
         end_point = '/future/m067/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_kq150_futures_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_kq150_futures_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/future/m067/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
     
-    def get_stock_futures_code_info(self):
+    def get_stock_futures_code_info(self, output: str = None):
         end_point = '/future/m091/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_stock_futures_basic_infos(self, tickers: list):
+    def get_stock_futures_basic_infos(self, tickers: list, output: str = None):
         end_point = '/future/m091/basic_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_stock_futures_orderbook_infos(self, tickers: list):
+    def get_stock_futures_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/future/m091/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_stock_futures_bbo_infos(self, tickers: list):
+    def get_stock_futures_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/future/m091/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_stock_futures_daily_info(self, ticker: str, start: str, end: str):
+    def get_stock_futures_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/future/m091/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)  
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)  
     
-    def get_stock_futures_tick_info(self, ticker: str, date: str):
+    def get_stock_futures_tick_info(self, ticker: str, date: str, output: str = None):
         end_point = 'futures/m091/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_stock_futures_kline_data_today_10s(self, index_code: str):
+    def get_stock_futures_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/future/m091/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_stock_futures_kline_data_intra_10s(self, index_code: str, date: str):
+    def get_stock_futures_kline_data_intra_10s(self, index_code: str, date: str, output: str = None):
         end_point = '/future/m091/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_stock_futures_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_stock_futures_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/future/m091/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')   
 
-    def get_k200_mini_futures_code_info(self):
+    def get_k200_mini_futures_code_info(self, output: str = None):
         end_point = '/future/m103/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_mini_futures_basic_infos(self, tickers: list):
+    def get_k200_mini_futures_basic_infos(self, tickers: list, output: str = None):
         end_point = '/future/m103/basic_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_mini_futures_orderbook_infos(self, tickers: list):
+    def get_k200_mini_futures_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/future/m103/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_mini_futures_bbo_infos(self, tickers: list):
+    def get_k200_mini_futures_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/future/m103/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_mini_futures_daily_info(self, ticker: str, start: str, end: str):
+    def get_k200_mini_futures_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/future/m103/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)  
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)  
     
-    def get_k200_mini_futures_tick_info(self, ticker: str, date: str):
+    def get_k200_mini_futures_tick_info(self, ticker: str, date: str, output: str = None):
         end_point = 'futures/m103/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_k200_mini_futures_kline_data_today_10s(self, index_code: str):
+    def get_k200_mini_futures_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/future/m103/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_k200_mini_futures_kline_data_intra_10s(self, index_code: str, date: str):
+    def get_k200_mini_futures_kline_data_intra_10s(self, index_code: str, date: str, output: str = None):
         end_point = '/future/m103/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_mini_futures_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_k200_mini_futures_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/future/m103/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
 
-    def get_k200_option_code_info(self):
+    def get_k200_option_code_info(self, output: str = None):
         end_point = '/future/m006/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_option_basic_infos(self, tickers: list):
+    def get_k200_option_basic_infos(self, tickers: list, output: str = None):
         end_point = '/future/m006/basic_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_option_orderbook_infos(self, tickers: list):
+    def get_k200_option_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/future/m006/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_option_bbo_infos(self, tickers: list):
+    def get_k200_option_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/future/m006/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_option_daily_info(self, ticker: str, start: str, end: str):
+    def get_k200_option_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/future/m006/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)  
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)  
     
-    def get_k200_option_tick_info(self, ticker: str, date: str):
+    def get_k200_option_tick_info(self, ticker: str, date: str, output: str = None):
         end_point = 'futures/m006/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_k200_option_kline_data_today_10s(self, index_code: str):
+    def get_k200_option_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/future/m006/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_k200_option_kline_data_intra_10s(self, index_code: str, date: str):
+    def get_k200_option_kline_data_intra_10s(self, index_code: str, date: str, output: str = None):
         end_point = '/future/m006/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_option_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_k200_option_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/future/m006/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
 
-    def get_k200_mini_option_code_info(self):
+    def get_k200_mini_option_code_info(self, output: str = None):
         end_point = '/future/m104/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_mini_option_basic_infos(self, tickers: list):
+    def get_k200_mini_option_basic_infos(self, tickers: list, output: str = None):
         end_point = '/future/m104/basic_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_mini_option_orderbook_infos(self, tickers: list):
+    def get_k200_mini_option_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/future/m104/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_mini_option_bbo_infos(self, tickers: list):
+    def get_k200_mini_option_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/future/m104/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_mini_option_daily_info(self, ticker: str, start: str, end: str):
+    def get_k200_mini_option_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/future/m104/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)  
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)  
     
-    def get_k200_mini_option_tick_info(self, ticker: str, date: str):
+    def get_k200_mini_option_tick_info(self, ticker: str, date: str, output: str = None):
         end_point = 'futures/m104/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_k200_mini_option_kline_data_today_10s(self, index_code: str):
+    def get_k200_mini_option_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/future/m104/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_k200_mini_option_kline_data_intra_10s(self, index_code: str, date: str):
+    def get_k200_mini_option_kline_data_intra_10s(self, index_code: str, date: str, output: str = None):
         end_point = '/future/m104/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_mini_option_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_k200_mini_option_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/future/m104/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
 
-    def get_k200_weekly_option_code_info(self):
+    def get_k200_weekly_option_code_info(self, output: str = None):
         end_point = '/future/m182/code_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_weekly_option_basic_infos(self, tickers: list):
+    def get_k200_weekly_option_basic_infos(self, tickers: list, output: str = None):
         end_point = '/future/m182/basic_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.NOT_TS)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.NOT_TS, output=output)
     
-    def get_k200_weekly_option_orderbook_infos(self, tickers: list):
+    def get_k200_weekly_option_orderbook_infos(self, tickers: list, output: str = None):
         end_point = '/future/m182/hoga_info_port'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_weekly_option_bbo_infos(self, tickers: list):
+    def get_k200_weekly_option_bbo_infos(self, tickers: list, output: str = None):
         end_point = '/future/m182/hoga_info_port_top'
-        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'codelist': ','.join(tickers)}
+        payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_port_data(end_point=end_point, payload=payload, tickers=tickers, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_weekly_option_daily_info(self, ticker: str, start: str, end: str):
+    def get_k200_weekly_option_daily_info(self, ticker: str, start: str, end: str, output: str = None):
         end_point = '/future/m182/hist_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'sdate': start, 'edate': end}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)  
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)  
     
-    def get_k200_weekly_option_tick_info(self, ticker: str, date: str):
+    def get_k200_weekly_option_tick_info(self, ticker: str, date: str, output: str = None):
         end_point = 'futures/m182/tick_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': ticker, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
 
-    def get_k200_weekly_option_kline_data_today_10s(self, index_code: str):
+    def get_k200_weekly_option_kline_data_today_10s(self, index_code: str, output: str = None):
         end_point = '/future/m182/intra_info'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
    
-    def get_k200_weekly_option_kline_data_intra_10s(self, index_code: str, date: str):
+    def get_k200_weekly_option_kline_data_intra_10s(self, index_code: str, date: str, output: str = None):
         end_point = '/future/m182/intra_date'
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'edate': date}
 
-        return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY)
+        return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.INTRA_DAY, output=output)
     
-    def get_k200_weekly_option_kline_data(self, index_code: str, interval: str, start: str, end: str):
+    def get_k200_weekly_option_kline_data(self, index_code: str, interval: str, start: str, end: str, output: str = None):
         end_point = '/future/m182/term_hist_info'
 
         if interval in RestCheckpy.KLINE_INTERVAL.keys():
             payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'jcode': index_code, 'term': RestCheckpy.KLINE_INTERVAL.get(interval), 'sdate': start, 'edate': end}
 
-            return self.__fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER)
+            return self._fetch_data(end_point=end_point, payload=payload, is_time_series=TimeSeriesType.OTHER, output=output)
         
         else:
             raise ValueError('Invalid interval')
@@ -0,0 +1,277 @@
+import asyncio
+import concurrent.futures
+import inspect
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import zlib
+
+from .checkenum import *
+from .codes import CodeIndex, generate_code, msg_sub_type
+from .streamcheck import StreamCheckpy
+from typing import List, Tuple, Union
+
+
+class ShardedStreamCheckpy(object):
+    # Codes are spread over N StreamCheckpy connections by crc32 of the subscribe code, so a code always lands on the same
+    # shard and its ticks stay in order. With processes=True each shard decodes in its own worker process.
+    def __init__(self, user_id, user_key, initial_subscribes: List[Tuple[Union[MarketType, SubType, str]]], shards: int = 4, processes: bool = False, queue_size: int = 10000, batch_size: int = 256, batch_interval: float = 0.01, **stream_kwargs):
+        # Every shard would replay the whole log, so a replay source is only served unsharded.
+        if shards > 1 and stream_kwargs.get('source') is not None:
+            raise ValueError('A replay source carries every code already; replay it with shards=1')
+
+        self.__user_id = user_id
+        self.__user_key = user_key
+        self.__shards = shards
+        self.__processes = processes
+        self.__queue_size = queue_size
+        self.__batch_size = batch_size
+        self.__batch_interval = batch_interval
+        self.__stream_kwargs = stream_kwargs
+        self.__subscribes = [[] for _ in range(shards)]
+        self.__code_index = CodeIndex()
+        self.__stats = [{'shard': shard, 'codes': 0, 'messages': 0, 'last_received': None, 'alive': False, 'error': None} for shard in range(shards)]
+        self.__streams = None
+        self.__commands = None
+
+        for subscribe in initial_subscribes:
+            self.__subscribes[self.__add_code(subscribe)].append(subscribe)
+
+    def shard_of(self, code: str) -> int:
+        return zlib.crc32(code.encode()) % self.__shards
+
+    def __add_code(self, subscribe) -> int:
+        code = generate_code(subscribe[0], subscribe[1], subscribe[2])
+        shard = self.shard_of(code)
+
+        if self.__code_index.add(code):
+            self.__stats[shard]['codes'] += 1
+
+        return shard
+
+    msg_sub_type = staticmethod(msg_sub_type)
+
+    def msg_code(self, msg) -> str:
+        return self.__code_index.msg_code(msg)
+
+    def stats(self) -> List[dict]:
+        return [dict(stat) for stat in self.__stats]
+
+    def __route(self, subscribes):
+        routed = {}
+
+        for subscribe in subscribes:
+            code = generate_code(subscribe[0], subscribe[1], subscribe[2])
+            routed.setdefault(self.shard_of(code), []).append(subscribe)
+
+        return routed
+
+    def subscribe(self, subscribes: List[Tuple[Union[MarketType, SubType, str]]]):
+        for shard, shard_subscribes in self.__route(subscribes).items():
+            for subscribe in shard_subscribes:
+                self.__add_code(subscribe)
+
+            self.__subscribes[shard].extend(shard_subscribes)
+            self.__send_command(shard, 'subscribe', shard_subscribes)
+
+    def unsubscribe(self, subscribes: List[Tuple[Union[MarketType, SubType, str]]]):
+        for shard, shard_subscribes in self.__route(subscribes).items():
+            for subscribe in shard_subscribes:
+                if self.__code_index.discard(generate_code(subscribe[0], subscribe[1], subscribe[2])):
+                    self.__stats[shard]['codes'] -= 1
+
+            removed = set(generate_code(*subscribe[:3]) for subscribe in shard_subscribes)
+            self.__subscribes[shard] = [subscribe for subscribe in self.__subscribes[shard] if generate_code(*subscribe[:3]) not in removed]
+            self.__send_command(shard, 'unsubscribe', shard_subscribes)
+
+    def __send_command(self, shard, command, subscribes):
+        if self.__streams is not None:
+            getattr(self.__streams[shard], command)(subscribes)
+
+        elif self.__commands is not None:
+            self.__commands[shard].put((command, [tuple(str(value) for value in subscribe[:3]) for subscribe in subscribes]))
+
+    def __record(self, shard, batch):
+        stat = self.__stats[shard]
+        stat['messages'] += len(batch)
+        stat['last_received'] = time.time()
+
+    async def __pump_stream(self, shard, stream, merged):
+        error = None
+
+        try:
+            async for msg in stream:
+                self.__record(shard, (msg,))
+                await merged.put([msg])
+
+        except Exception as stream_error:
+            error = stream_error
+
+        await merged.put((shard, error))
+
+    @staticmethod
+    def _run_shard(user_id, user_key, subscribes, stream_kwargs, out_queue, commands, batch_size, batch_interval):
+        stream = StreamCheckpy(user_id, user_key, subscribes, **stream_kwargs)
+        batch = []
+
+        def listen():
+            while True:
+                command = commands.get()
+
+                if command is None:
+                    return
+
+                getattr(stream, command[0])(command[1])
+
+        def collect(msg):
+            batch.append(msg)
+
+            if len(batch) >= batch_size:
+                out_queue.put(batch[:])
+                batch.clear()
+
+        async def flush():
+            while True:
+                await asyncio.sleep(batch_interval)
+
+                if batch != []:
+                    out_queue.put(batch[:])
+                    batch.clear()
+
+        async def main():
+            # A stream that returns (a finished replay, a clean stop) ends the worker, which the reader reports as a shard end.
+            flusher = asyncio.create_task(flush())
+
+            try:
+                await stream.start(collect)
+
+            finally:
+                flusher.cancel()
+
+                if batch != []:
+                    out_queue.put(batch[:])
+
+        threading.Thread(target=listen, daemon=True).start()
+        asyncio.run(main())
+
+    @staticmethod
+    def __post(item, merged, loop) -> bool:
+        # False once the consumer has stopped iterating and its loop cancelled the put or closed.
+        try:
+            asyncio.run_coroutine_threadsafe(merged.put(item), loop).result()
+
+            return True
+
+        except (concurrent.futures.CancelledError, RuntimeError):
+            return False
+
+    def __read_worker(self, shard, worker, out_queue, merged, loop, stopped):
+        while not stopped.is_set():
+            try:
+                batch = out_queue.get(timeout=0.5)
+
+            except queue.Empty:
+                if not worker.is_alive():
+                    self.__post((shard, f'worker exited with code {worker.exitcode}' if worker.exitcode != 0 else None), merged, loop)
+
+                    return
+
+                continue
+
+            self.__record(shard, batch)
+
+            if not self.__post(batch, merged, loop):
+                return
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        merged = asyncio.Queue(maxsize=max(1, self.__queue_size // self.__batch_size) if self.__processes else self.__queue_size)
+        tasks, workers, readers, stopped = [], [], [], threading.Event()
+
+        if self.__processes:
+            # spawn avoids forking a process that already runs an event loop.
+            context = multiprocessing.get_context('spawn')
+            self.__commands = [context.Queue() for _ in range(self.__shards)]
+
+            for shard in range(self.__shards):
+                out_queue = context.Queue(maxsize=self.__queue_size // self.__batch_size + 1)
+                subscribes = [tuple(str(value) for value in subscribe[:3]) for subscribe in self.__subscribes[shard]]
+                worker = context.Process(target=ShardedStreamCheckpy._run_shard, args=(self.__user_id, self.__user_key, subscribes, self.__stream_kwargs, out_queue, self.__commands[shard], self.__batch_size, self.__batch_interval), daemon=True)
+                worker.start()
+                workers.append(worker)
+                reader = threading.Thread(target=self.__read_worker, args=(shard, worker, out_queue, merged, loop, stopped), daemon=True)
+                reader.start()
+                readers.append(reader)
+
+        else:
+            self.__streams = [StreamCheckpy(self.__user_id, self.__user_key, self.__subscribes[shard], **self.__stream_kwargs) for shard in range(self.__shards)]
+            tasks = [asyncio.create_task(self.__pump_stream(shard, stream, merged)) for shard, stream in enumerate(self.__streams)]
+
+        for stat in self.__stats:
+            stat['alive'], stat['error'] = True, None
+
+        ended = 0
+
+        try:
+            while True:
+                batch = await merged.get()
+
+                # Batches are lists; a (shard, error) tuple says that shard stopped. A failed shard ends the iteration, so its
+                # codes never go silent unnoticed, while a replay that finished leaves the other shards running.
+                if isinstance(batch, tuple):
+                    shard, error = batch
+                    self.__stats[shard]['alive'] = False
+
+                    if error is not None:
+                        self.__stats[shard]['error'] = repr(error) if isinstance(error, BaseException) else error
+
+                        raise RuntimeError(f'Shard {shard} stopped: {self.__stats[shard]["error"]}') from (error if isinstance(error, BaseException) else None)
+
+                    ended += 1
+
+                    if ended == self.__shards:
+                        return
+
+                    continue
+
+                for msg in batch:
+                    yield msg
+
+        finally:
+            stopped.set()
+
+            for stat in self.__stats:
+                stat['alive'] = False
+
+            for task in tasks:
+                task.cancel()
+
+            for command_queue in self.__commands or []:
+                command_queue.put(None)
+
+            for worker in workers:
+                worker.terminate()
+
+            self.__streams = None
+            self.__commands = None
+
+    async def start(self, callback):
+        is_coroutine = inspect.iscoroutinefunction(callback)
+
+        async for msg in self:
+            if is_coroutine:
+                await callback(msg)
+
+            else:
+                callback(msg)
+
+    def run(self, callback):
+        task = asyncio.get_event_loop()
+
+        try:
+            task.run_until_complete(self.start(callback=callback))
+
+        except KeyboardInterrupt:
+            sys.exit()
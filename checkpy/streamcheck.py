@@ -1,24 +1,63 @@
 import websockets
 import asyncio
+import inspect
 import logging
+import random
 import sys
+import threading
+import time
 import json
-from json.decoder import JSONDecodeError
+from concurrent.futures import Executor
+from operator import itemgetter
 
 from .checkenum import *
-from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
+from .backfill import TickBackfiller
+from .codes import CodeIndex, generate_code, msg_sub_type
+from .dispatch import TickQueue
+from .fieldmap import load_field_map
+from .records import RECORD_TYPES, StreamEvent
+from .replay import ReplaySource, StreamRecorder
+from websockets.exceptions import WebSocketException
 from typing import List, Tuple, Union
 
 
 class StreamCheckpy(object):
-    def __init__(self, user_id, user_key, initial_subscribes: List[Tuple[Union[MarketType, SubType, str]]]):
+    END_OF_STREAM = object()
+
+    def __init__(self, user_id, user_key, initial_subscribes: List[Tuple[Union[MarketType, SubType, str]]], queue_size: int = 10000, backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK, executor: Executor = None, max_pending: int = 64, conflate_sub_types: Tuple[SubType] = (SubType.ORDERBOOK,), flush_interval: float = None, json_backend: str = None, record_mode: bool = False, batch_interval: float = 0.05, reconnect_delay: float = 0.5, max_reconnect_delay: float = 30.0, ping_interval: float = 20.0, stall_timeout: float = None, events: bool = False, rest_client=None, recorder: StreamRecorder = None, source: ReplaySource = None, wss_uri: str = 'wss://newmobile.koscom.co.kr'):
         self.__user_id = user_id
         self.__user_key = user_key
-        self.__wss_uri = 'wss://newmobile.koscom.co.kr'
-        self.__subscribes = {self.__generate_code(initial_subscribe[0], initial_subscribe[1], initial_subscribe[2]): SubscribeStatus.UNSUBSCRIBED for initial_subscribe in initial_subscribes}
-
-        with open('checkpy/translate.json') as f:
-            self.__translate = json.load(f)
+        self.__wss_uri = wss_uri
+        self.__subscribes = {generate_code(initial_subscribe[0], initial_subscribe[1], initial_subscribe[2]): SubscribeStatus.UNSUBSCRIBED for initial_subscribe in initial_subscribes}
+        self.__code_index = CodeIndex(self.__subscribes.keys())
+        self.__translate = load_field_map()
+        self.__key_maps = {}
+        self.__loads, self.__decode_errors = self.__load_json_backend(json_backend)
+        self.__record_mode = record_mode
+        self.__queue_size = queue_size
+        self.__backpressure = BackpressurePolicy(backpressure)
+        self.__executor = executor
+        self.__max_pending = max_pending
+        self.__conflate_sub_types = frozenset(conflate_sub_types)
+        self.__flush_interval = flush_interval
+        self.__queue = None
+        self.__lock = threading.Lock()
+        self.__pending = {}
+        self.__in_flight = set()
+        self.__batch_interval = batch_interval
+        self.__loop = None
+        self.__changed = None
+        self.__reconnect_delay = reconnect_delay
+        self.__max_reconnect_delay = max_reconnect_delay
+        self.__ping_interval = ping_interval
+        self.__stall_timeout = stall_timeout
+        self.__events = events
+        self.__backfiller = TickBackfiller(rest_client) if rest_client is not None else None
+        self.__last_received = None
+        self.__last_tr_times = {}
+        self.__catch_up = {}
+        self.__recorder = recorder
+        self.__source = source
 
     def __generate_subscribe_msg(self, code):
         payload = {'cust_id': self.__user_id, 'auth_key': self.__user_key, 'dtype': 'open_sise', 'scode': code}
@@ -30,46 +69,387 @@ class StreamCheckpy(object):
 
         return json.dumps(payload)
     
-    def __generate_subscribe_msgs(self):
-        return '|'.join([self.__generate_subscribe_msg(code) for code in self.__subscribes.keys()])
+    def __generate_subscribe_msgs(self, codes):
+        return '|'.join([self.__generate_subscribe_msg(code) for code in codes])
+
+    @property
+    def subscribes(self) -> dict:
+        with self.__lock:
+            return dict(self.__subscribes)
+
+    def __notify(self):
+        loop = self.__loop
+
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.__changed.set)
+
+    def subscribe(self, subscribes: List[Tuple[Union[MarketType, SubType, str]]]) -> List[str]:
+        # Safe to call from any thread or coroutine; the change is sent on the live connection by its sender task.
+        codes = [generate_code(subscribe[0], subscribe[1], subscribe[2]) for subscribe in subscribes]
+
+        with self.__lock:
+            for code in codes:
+                # The code is still open on the server while its close waits to be sent, so cancelling the close is enough.
+                if self.__pending.get(code) == 'close_sise':
+                    del self.__pending[code]
+                    self.__subscribes[code] = SubscribeStatus.UNSUBSCRIBED if code in self.__in_flight else SubscribeStatus.SUBSCRIBED
+                    self.__code_index.add(code)
+
+                elif code not in self.__subscribes:
+                    self.__subscribes[code] = SubscribeStatus.UNSUBSCRIBED
+                    self.__code_index.add(code)
+                    self.__pending[code] = 'open_sise'
+
+        self.__notify()
+
+        return codes
+
+    def unsubscribe(self, subscribes: List[Tuple[Union[MarketType, SubType, str]]]) -> List[str]:
+        codes = [generate_code(subscribe[0], subscribe[1], subscribe[2]) for subscribe in subscribes]
+
+        with self.__lock:
+            for code in codes:
+                status = self.__subscribes.pop(code, None)
+
+                if status is None:
+                    continue
+
+                self.__code_index.discard(code)
+
+                # An open_sise already on its way is answered by the server like a confirmed one, so it needs a close_sise too.
+                if self.__pending.pop(code, None) is None and (status == SubscribeStatus.SUBSCRIBED or code in self.__in_flight):
+                    self.__pending[code] = 'close_sise'
+
+        self.__notify()
+
+        return codes
+
+    def __take_pending(self):
+        with self.__lock:
+            pending, self.__pending = self.__pending, {}
+            self.__in_flight = {code for code, dtype in pending.items() if dtype == 'open_sise'}
+
+        return pending
+
+    def __mark_subscribed(self, codes):
+        with self.__lock:
+            for code in codes:
+                if code in self.__subscribes:
+                    self.__subscribes[code] = SubscribeStatus.SUBSCRIBED
+
+            self.__in_flight = set()
+
+    async def __send_changes(self, check_wss):
+        # Changes arriving within batch_interval of each other are sent together as one '|' joined frame.
+        while True:
+            await self.__changed.wait()
+            await asyncio.sleep(self.__batch_interval)
+            self.__changed.clear()
+            pending = self.__take_pending()
+
+            if pending == {}:
+                continue
+
+            await check_wss.send('|'.join([self.__generate_subscribe_msg(code) if dtype == 'open_sise' else self.__generate_unsubscribe_msg(code) for code, dtype in pending.items()]))
+            self.__mark_subscribed([code for code, dtype in pending.items() if dtype == 'open_sise'])
 
     @staticmethod
-    def __generate_code(market_type: MarketType, sub_type: SubType, ticker) -> str:
-        return f'{market_type}{sub_type}{ticker}'
-    
+    def __load_json_backend(name):
+        # orjson and msgspec are optional; the fastest installed one is used unless a backend is named explicitly.
+        for backend in ([name] if name is not None else ['orjson', 'msgspec', 'json']):
+            try:
+                if backend == 'orjson':
+                    import orjson
+
+                    return orjson.loads, (orjson.JSONDecodeError,)
+
+                elif backend == 'msgspec':
+                    import msgspec
+
+                    return msgspec.json.decode, (msgspec.DecodeError,)
+
+                elif backend == 'json':
+                    return json.loads, (ValueError,)
+
+            except ImportError:
+                if name is not None:
+                    raise
+
+        raise ValueError(f'Unknown json backend: {name}')
+
+    def __build_key_map(self, keys: tuple):
+        codes = [key for key in keys if key in self.__translate]
+        getter = itemgetter(*codes) if len(codes) > 1 else (lambda msg: (msg[codes[0]],)) if len(codes) == 1 else (lambda msg: ())
+        self.__key_maps[keys] = key_map = ([self.__translate[code] for code in codes], getter)
+
+        return key_map
+
     def __convert_keys(self, msg):
-        return {self.__translate.get(key): value for key, value in msg.items() if key in self.__translate.keys()}
+        # Frames of one message type share their key order, so the translated names and getter are built once per key tuple.
+        keys = tuple(msg)
+        names, getter = self.__key_maps.get(keys) or self.__build_key_map(keys)
+
+        return dict(zip(names, getter(msg)))
+
+    msg_sub_type = staticmethod(msg_sub_type)
+
+    def msg_code(self, msg) -> str:
+        return self.__code_index.msg_code(msg)
 
-    def __process_msg(self, msg, callback):
+    def __process_msg(self, msg):
         try:
-            parsed_msg = json.loads(msg)
+            data = self.__loads(msg).get('data')
 
-            if 'data' in parsed_msg.keys():
-                callback(self.__convert_keys(parsed_msg.get('data')))
+            if data is not None:
+                msg = self.__convert_keys(data)
+
+                return RECORD_TYPES[self.msg_sub_type(msg)].from_msg(msg) if self.__record_mode else msg
         
-        except JSONDecodeError:
+        except self.__decode_errors:
             pass
 
-    async def __start_stream(self, callback):
+    def __create_queue(self):
+        self.__queue = TickQueue(maxsize=self.__queue_size, policy=self.__backpressure, flush_interval=self.__flush_interval)
+
+        return self.__queue
+
+    async def __put(self, key, msg):
+        if not self.__queue.put_nowait(key, msg):
+            await self.__queue.put(key, msg)
+
+    async def __emit_event(self, event):
+        if self.__events:
+            await self.__put(None, event)
+
+    def __backoff(self, attempt) -> float:
+        # Equal jitter keeps at least half of the exponential delay while spreading out clients that dropped together.
+        delay = min(self.__max_reconnect_delay, self.__reconnect_delay * 2 ** attempt)
+
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def __watch_stall(self, check_wss):
+        while True:
+            await asyncio.sleep(self.__stall_timeout / 2)
+
+            if time.time() - self.__last_received > self.__stall_timeout:
+                logging.warning(f'No message for {self.__stall_timeout}s, reconnecting')
+                await check_wss.close()
+
+                return
+
+    def __is_caught_up(self, msg) -> bool:
+        # Live ticks already delivered by the backfill are skipped until the feed moves past the last backfilled one. The
+        # watermark holds that TR_TIME and how many backfilled ticks share it.
+        code = self.msg_code(msg)
+        watermark = self.__catch_up.get(code)
+
+        if watermark is None or self.msg_sub_type(msg) != SubType.TRANSACTION:
+            return True
+
+        tr_time = TickBackfiller.parse_tr_time(msg.get('TR_TIME'))
+
+        if tr_time is not None and (tr_time < watermark[0] or (tr_time == watermark[0] and watermark[1] > 0)):
+            if tr_time == watermark[0]:
+                watermark[1] -= 1
+
+            return False
+
+        del self.__catch_up[code]
+
+        return True
+
+    def __track_tr_time(self, msg):
+        tr_time = TickBackfiller.parse_tr_time(msg.get('TR_TIME'))
+
+        if tr_time is not None:
+            code = self.msg_code(msg)
+            last = self.__last_tr_times.get(code)
+            self.__last_tr_times[code] = (tr_time, last[1] + 1 if last is not None and last[0] == tr_time else 1)
+
+    async def __backfill(self, codes, since):
+        loop = asyncio.get_running_loop()
+        codes = [code for code in codes if code[5] == SubType.TRANSACTION and self.__backfiller.supports(code)]
+        fetches = []
+
+        for code in codes:
+            after, seen = self.__last_tr_times.get(code, (None, 0))
+            fetches.append(loop.run_in_executor(None, self.__backfiller.fetch, code, after, since, seen))
+
+        results = await asyncio.gather(*fetches, return_exceptions=True)
+        count = 0
+
+        for code, ticks in zip(codes, results):
+            if isinstance(ticks, Exception):
+                logging.error(f'Backfill failed for {code}: {ticks!r}')
+
+                continue
+
+            for tick in ticks:
+                await self.__put(None, RECORD_TYPES[SubType.TRANSACTION].from_msg(tick) if self.__record_mode else tick)
+
+            if ticks != []:
+                last_tr_time, last_seen = self.__last_tr_times.get(code, (None, 0))
+                tr_time = TickBackfiller.parse_tr_time(ticks[-1]['TR_TIME'])
+                shared = sum(1 for tick in ticks if TickBackfiller.parse_tr_time(tick['TR_TIME']) == tr_time) + (last_seen if tr_time == last_tr_time else 0)
+                self.__last_tr_times[code] = (tr_time, shared)
+                self.__catch_up[code] = [tr_time, shared]
+                count += len(ticks)
+
+        await self.__emit_event(StreamEvent(StreamEventType.BACKFILLED, time.time(), tuple(codes), since, time.time(), count))
+
+    async def __start_stream(self):
+        conflate = self.__backpressure == BackpressurePolicy.CONFLATE
+        self.__loop = asyncio.get_running_loop()
+        self.__changed = asyncio.Event()
+        attempt, disconnected_at = 0, None
+
         while True:
             try:
-                async with websockets.connect(self.__wss_uri) as check_wss:
-                    await check_wss.send(self.__generate_subscribe_msgs())
-                    self.__subscribes = {key: SubscribeStatus.SUBSCRIBED for key in self.__subscribes.keys()}
-                
-                    while check_wss.open:
-                        self.__process_msg(await check_wss.recv(), callback=callback)
-            
-            except (ConnectionClosedError, ConnectionClosedOK) as WebsocketError:
-                logging.error(f'Wss error occurs reason: {WebsocketError}')
-                self.__subscribes = {key: SubscribeStatus.UNSUBSCRIBED for key in self.__subscribes.keys()}
-                await asyncio.sleep(1)
+                async with (self.__source.connect() if self.__source is not None else websockets.connect(self.__wss_uri, ping_interval=self.__ping_interval, ping_timeout=self.__ping_interval)) as check_wss:
+                    # A fresh connection subscribes the whole current set, which also covers any changes still pending.
+                    with self.__lock:
+                        self.__pending.clear()
+                        codes = list(self.__subscribes.keys())
+                        self.__in_flight = set(codes)
+
+                    if codes != []:
+                        await check_wss.send(self.__generate_subscribe_msgs(codes))
+
+                    self.__mark_subscribed(codes)
+
+                    attempt = 0
+                    self.__last_received = time.time()
+
+                    if disconnected_at is not None:
+                        await self.__emit_event(StreamEvent(StreamEventType.RECONNECTED, time.time(), tuple(codes), disconnected_at, self.__last_received))
+
+                        # Live frames wait in the socket buffer meanwhile, so backfilled ticks are delivered first and in order.
+                        if self.__backfiller is not None:
+                            await self.__backfill(codes, disconnected_at)
+
+                        disconnected_at = None
+
+                    tasks = [asyncio.create_task(self.__send_changes(check_wss))]
+
+                    if self.__stall_timeout is not None:
+                        tasks.append(asyncio.create_task(self.__watch_stall(check_wss)))
+
+                    try:
+                        async for raw_msg in check_wss:
+                            self.__last_received = time.time()
+
+                            if self.__recorder is not None:
+                                self.__recorder.write(raw_msg, self.__last_received)
+
+                            msg = self.__process_msg(raw_msg)
+
+                            if msg is not None:
+                                if self.__backfiller is not None:
+                                    if self.__catch_up and not self.__is_caught_up(msg):
+                                        continue
+
+                                    if self.msg_sub_type(msg) == SubType.TRANSACTION:
+                                        self.__track_tr_time(msg)
+
+                                # Feeds outside conflate_sub_types go in without a key, so they are still delivered in full and in order.
+                                key = self.msg_code(msg) if conflate and self.msg_sub_type(msg) in self.__conflate_sub_types else None
+
+                                if not self.__queue.put_nowait(key, msg):
+                                    await self.__queue.put(key, msg)
+
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+
+            except (WebSocketException, OSError, TimeoutError) as WebsocketError:
+                logging.error(f'Wss error occurs reason: {WebsocketError!r}')
+
+            # A replay plays once, then the consumer is told the stream has ended.
+            if self.__source is not None:
+                await self.__put(None, StreamCheckpy.END_OF_STREAM)
+
+                return
+
+            with self.__lock:
+                for code in self.__subscribes.keys():
+                    self.__subscribes[code] = SubscribeStatus.UNSUBSCRIBED
+
+            if disconnected_at is None and self.__last_received is not None:
+                disconnected_at = self.__last_received
+                await self.__emit_event(StreamEvent(StreamEventType.DISCONNECTED, time.time(), tuple(self.subscribes.keys()), disconnected_at))
+
+            await asyncio.sleep(self.__backoff(attempt))
+            attempt += 1
+
+    @staticmethod
+    def __log_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            logging.error(f'Callback failed in executor: {future.exception()!r}')
+
+    async def __consume(self, callback):
+        loop = asyncio.get_running_loop()
+        pending = asyncio.Semaphore(self.__max_pending)
+        is_coroutine = inspect.iscoroutinefunction(callback)
+
+        while True:
+            msg = await self.__queue.get()
+
+            if msg is StreamCheckpy.END_OF_STREAM:
+                return
+
+            if is_coroutine:
+                await callback(msg)
+
+            elif self.__executor is not None:
+                await pending.acquire()
+                future = loop.run_in_executor(self.__executor, callback, msg)
+                future.add_done_callback(lambda future: pending.release())
+                future.add_done_callback(self.__log_failure)
+
+            else:
+                callback(msg)
+
+    async def start(self, callback):
+        self.__create_queue()
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self.__start_stream())
+            group.create_task(self.__consume(callback))
+
+    async def __aiter__(self):
+        queue = self.__create_queue()
+        receiver = asyncio.create_task(self.__start_stream())
+
+        try:
+            while True:
+                if len(queue) == 0:
+                    getter = asyncio.ensure_future(queue.get())
+                    await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+
+                    if not getter.done():
+                        getter.cancel()
+                        receiver.result()
+
+                        continue
+
+                    msg = getter.result()
+
+                else:
+                    msg = queue.get_nowait()
+
+                if msg is StreamCheckpy.END_OF_STREAM:
+                    return
+
+                yield msg
+
+        finally:
+            receiver.cancel()
 
     def run(self, callback):
         task = asyncio.get_event_loop()
 
         try:
-            task.run_until_complete(self.__start_stream(callback=callback))
+            task.run_until_complete(self.start(callback=callback))
         
         except KeyboardInterrupt:
             sys.exit()
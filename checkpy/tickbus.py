@@ -0,0 +1,165 @@
+import json
+import re
+import struct
+import time
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+
+from .fieldmap import load_field_map
+from .records import RECORD_TYPES, StreamEvent, TickRecord, to_float
+
+
+class TickBus(object):
+    # Single producer, many consumers over one shared memory segment: a header with the record layout and the published
+    # sequence, followed by a ring of fixed-width records. Every record is written at slot and slot + capacity, so any run
+    # of the latest records is one contiguous numpy view. Readers never lock; they check the sequence afterwards instead.
+    MAGIC = b'CHKPYBUS'
+    HEADER = struct.Struct('<8sQQQ')
+    HEADER_SIZE = 4096
+    SEQUENCE_OFFSET = 8
+    CREATED = set()
+
+    def __init__(self, stream=None, name: str = None, capacity: int = 1 << 16, fields: tuple = None):
+        self.__stream = stream
+        self.__capacity = capacity
+        self.__dtype = self.__build_dtype(fields)
+        self.__fields = self.__dtype.names[4:]
+        self.__numeric = [self.__dtype[name].kind == 'f' for name in self.__fields]
+        descr = json.dumps(self.__dtype.descr).encode()
+
+        if TickBus.HEADER.size + len(descr) > TickBus.HEADER_SIZE:
+            raise ValueError(f'Record layout of {len(self.__fields)} fields does not fit the {TickBus.HEADER_SIZE} byte header')
+
+        self.__shm = shared_memory.SharedMemory(name=name, create=True, size=TickBus.HEADER_SIZE + 2 * capacity * self.__dtype.itemsize)
+        TickBus.CREATED.add(self.__shm.name)
+        TickBus.HEADER.pack_into(self.__shm.buf, 0, TickBus.MAGIC, 0, capacity, len(descr))
+        self.__shm.buf[TickBus.HEADER.size:TickBus.HEADER.size + len(descr)] = descr
+        self.__sequence = np.ndarray((1,), dtype='<u8', buffer=self.__shm.buf, offset=TickBus.SEQUENCE_OFFSET)
+        self.__ring = np.ndarray((2 * capacity,), dtype=self.__dtype, buffer=self.__shm.buf, offset=TickBus.HEADER_SIZE)
+        self.__next = 0
+
+    @staticmethod
+    def __build_dtype(fields):
+        # Numeric fields become float64 with NaN for missing values and CHAR(n) fields fixed-width bytes, per Table.xlsx.
+        field_map = load_field_map()
+        names = []
+
+        for name in fields or [name for record_type in RECORD_TYPES.values() for name in record_type.FIELDS]:
+            if name != 'ABBV_CODE' and name not in names:
+                names.append(name)
+
+        layout = [('SEQ', '<u8'), ('RECV_NS', '<i8'), ('CODE', 'S16'), ('SUB_TYPE', 'S1')]
+
+        for name in names:
+            sql_type = field_map.types[field_map.codes(name)[0]]
+            width = re.match(r'(?:VAR)?CHAR\((\d+)\)', sql_type)
+            layout.append((name, f'S{width.group(1)}' if width is not None else '<f8'))
+
+        return np.dtype(layout)
+
+    @property
+    def name(self) -> str:
+        return self.__shm.name
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.__dtype
+
+    def __call__(self, msg):
+        if not isinstance(msg, StreamEvent):
+            self.publish(self.__stream.msg_code(msg), msg)
+
+    def publish(self, code: str, msg):
+        slot = self.__next % self.__capacity
+        values = [getattr(msg, name, None) for name in self.__fields] if isinstance(msg, TickRecord) else [msg.get(name, np.nan) for name in self.__fields]
+
+        if None in values or '' in values:
+            values = [np.nan if value is None or value == '' else value for value in values]
+
+        record = (self.__next, time.time_ns(), code.encode(), code[5:6].encode(), *values)
+
+        # The ring is stored before the sequence moves, so readers only see complete records (x86 keeps store order).
+        try:
+            self.__ring[slot] = record
+
+        except (TypeError, ValueError):
+            self.__ring[slot] = record[:4] + tuple(to_float(value) if numeric else b'' if value is None else str(value).encode(errors='replace') for value, numeric in zip(values, self.__numeric))
+        self.__ring[slot + self.__capacity] = self.__ring[slot]
+        self.__next += 1
+        self.__sequence[0] = self.__next
+
+    def close(self):
+        self.__sequence = self.__ring = None
+        self.__shm.close()
+
+    def unlink(self):
+        TickBus.CREATED.discard(self.__shm.name)
+        self.__shm.unlink()
+
+
+class TickBusReader(object):
+    def __init__(self, name: str, start: int = None):
+        self.__shm = shared_memory.SharedMemory(name=name)
+        # Attaching must not make this process the owner; the producer unlinks the segment.
+        if self.__shm.name not in TickBus.CREATED:
+            resource_tracker.unregister(self.__shm._name, 'shared_memory')
+        magic, _, self.__capacity, descr_length = TickBus.HEADER.unpack_from(self.__shm.buf, 0)
+
+        if magic != TickBus.MAGIC:
+            raise ValueError(f'{name} is not a tick bus')
+
+        descr = json.loads(bytes(self.__shm.buf[TickBus.HEADER.size:TickBus.HEADER.size + descr_length]))
+        self.__dtype = np.dtype([tuple(field) for field in descr])
+        self.__sequence = np.ndarray((1,), dtype='<u8', buffer=self.__shm.buf, offset=TickBus.SEQUENCE_OFFSET)
+        self.__ring = np.ndarray((2 * self.__capacity,), dtype=self.__dtype, buffer=self.__shm.buf, offset=TickBus.HEADER_SIZE)
+        self.__next = int(self.__sequence[0]) if start is None else start
+        self.__view_start = self.__next
+        self.__lapped = 0
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.__dtype
+
+    @property
+    def lapped(self) -> int:
+        return self.__lapped
+
+    @property
+    def position(self) -> int:
+        return self.__next
+
+    def poll(self, max_records: int = None) -> np.ndarray:
+        # Returns a zero-copy view of the records published since the last poll. A reader that fell more than a ring behind
+        # skips ahead and counts the lost records in lapped.
+        published = int(self.__sequence[0])
+
+        if published - self.__next > self.__capacity - 1:
+            skipped = published - (self.__capacity - 1) - self.__next
+            self.__lapped += skipped
+            self.__next += skipped
+
+        end = published if max_records is None else min(published, self.__next + max_records)
+        start, self.__view_start = self.__next, self.__next
+        self.__next = end
+        slot = start % self.__capacity
+
+        return self.__ring[slot:slot + end - start]
+
+    def valid(self) -> bool:
+        # True while the last polled view has not been overwritten; check it after reading the view, or copy the view first.
+        return int(self.__sequence[0]) < self.__view_start + self.__capacity
+
+    def read(self, max_records: int = None, timeout: float = None, interval: float = 0.0001) -> np.ndarray:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            view = self.poll(max_records)
+
+            if len(view) > 0 or (deadline is not None and time.monotonic() >= deadline):
+                return view
+
+            time.sleep(interval)
+
+    def close(self):
+        self.__sequence = self.__ring = None
+        self.__shm.close()
@@ -0,0 +1,119 @@
+import numpy as np
+
+from .checkenum import MarketType, SubType
+from .records import RECORD_TYPES, StreamEvent, TickRecord, to_float
+
+
+class TickRing(object):
+    # Every row is written twice, at pos and pos + capacity, so the latest n rows are always one contiguous slice.
+    def __init__(self, fields: tuple, capacity: int):
+        self.__fields = tuple(fields)
+        self.__index = {name: i for i, name in enumerate(self.__fields)}
+        self.__capacity = capacity
+        self.__data = np.full((2 * capacity, len(self.__fields)), np.nan)
+        self.__pos = -1
+        self.__count = 0
+
+    def __len__(self):
+        return self.__count
+
+    @property
+    def fields(self) -> tuple:
+        return self.__fields
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def nbytes(self) -> int:
+        return self.__data.nbytes
+
+    def append(self, values):
+        pos = self.__pos = (self.__pos + 1) % self.__capacity
+
+        try:
+            self.__data[pos] = values
+
+        except (TypeError, ValueError):
+            self.__data[pos] = [to_float(value) for value in values]
+
+        self.__data[pos + self.__capacity] = self.__data[pos]
+        self.__count = min(self.__count + 1, self.__capacity)
+
+    def __slice(self, n):
+        end = self.__pos + self.__capacity + 1
+
+        return self.__data[end - n:end]
+
+    def window(self, n: int = None) -> dict:
+        n = self.__count if n is None else min(n, self.__count)
+        rows = self.__slice(n)
+
+        return {name: rows[:, i] for i, name in enumerate(self.__fields)}
+
+    def values(self, n: int = None) -> np.ndarray:
+        return self.__slice(self.__count if n is None else min(n, self.__count))
+
+    def last(self) -> dict:
+        return {name: value for name, value in zip(self.__fields, self.__data[self.__pos])} if self.__count > 0 else None
+
+    def since(self, value, field: str = 'TR_TIME') -> dict:
+        # Assumes the field is non-decreasing within the buffer, which holds for TR_TIME within a session.
+        rows = self.__slice(self.__count)
+        start = np.searchsorted(rows[:, self.__index[field]], value, side='left')
+
+        return {name: rows[start:, i] for i, name in enumerate(self.__fields)}
+
+
+class TickStore(object):
+    # Keeps the latest ticks of each subscribe code in a TickRing. Caps are bytes per code, set per MarketType.
+    def __init__(self, stream, max_bytes: dict = None, default_max_bytes: int = 4 * 2 ** 20, fields: dict = None):
+        self.__stream = stream
+        self.__max_bytes = {MarketType(market_type): size for market_type, size in (max_bytes or {}).items()}
+        self.__default_max_bytes = default_max_bytes
+        self.__fields = {sub_type: tuple(name for name in record_type.FIELDS if name != 'ABBV_CODE') for sub_type, record_type in RECORD_TYPES.items()}
+        self.__fields.update({SubType(sub_type): tuple(names) for sub_type, names in (fields or {}).items()})
+        self.__rings = {}
+
+    def __call__(self, msg):
+        self.append(msg)
+
+    def __getitem__(self, code) -> TickRing:
+        return self.__rings[code]
+
+    def __contains__(self, code):
+        return code in self.__rings
+
+    def get(self, code, default=None) -> TickRing:
+        return self.__rings.get(code, default)
+
+    def codes(self) -> list:
+        return list(self.__rings.keys())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ring.nbytes for ring in self.__rings.values())
+
+    def __create_ring(self, code, sub_type):
+        fields = self.__fields[sub_type]
+        max_bytes = self.__max_bytes.get(code[:5], self.__default_max_bytes)
+        ring = self.__rings[code] = TickRing(fields, max(1, max_bytes // (2 * 8 * len(fields))))
+
+        return ring
+
+    def append(self, msg):
+        if isinstance(msg, StreamEvent):
+            return
+
+        sub_type, code = self.__stream.msg_sub_type(msg), self.__stream.msg_code(msg)
+        ring = self.__rings.get(code)
+
+        if ring is None:
+            ring = self.__create_ring(code, sub_type)
+
+        if isinstance(msg, TickRecord):
+            ring.append([getattr(msg, name, None) for name in ring.fields])
+
+        else:
+            ring.append([msg.get(name) for name in ring.fields])
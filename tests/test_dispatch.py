@@ -0,0 +1,104 @@
+import asyncio
+
+from checkpy import BackpressurePolicy
+from checkpy.dispatch import TickQueue
+
+
+def drain(queue):
+    return [queue.get_nowait() for _ in range(len(queue))]
+
+
+def test_block_refuses_when_full():
+    queue = TickQueue(maxsize=2, policy=BackpressurePolicy.BLOCK)
+
+    assert queue.put_nowait(None, 1) and queue.put_nowait(None, 2)
+    assert not queue.put_nowait(None, 3)
+    assert drain(queue) == [1, 2]
+    assert queue.dropped == 0
+
+
+def test_block_put_waits_for_the_consumer():
+    async def main():
+        queue = TickQueue(maxsize=2, policy=BackpressurePolicy.BLOCK)
+
+        async def produce():
+            for i in range(5):
+                await queue.put(None, i)
+
+        producer = asyncio.create_task(produce())
+        received = [await queue.get() for _ in range(5)]
+        await producer
+
+        return received
+
+    assert asyncio.run(main()) == [0, 1, 2, 3, 4]
+
+
+def test_drop_oldest_keeps_the_latest():
+    queue = TickQueue(maxsize=3, policy=BackpressurePolicy.DROP_OLDEST)
+
+    for i in range(5):
+        assert queue.put_nowait(None, i)
+
+    assert drain(queue) == [2, 3, 4]
+    assert queue.dropped == 2
+
+
+def test_conflate_keeps_the_latest_per_key_in_first_seen_order():
+    queue = TickQueue(maxsize=10, policy=BackpressurePolicy.CONFLATE)
+
+    for key, item in [('A', 'a1'), ('B', 'b1'), ('A', 'a2'), (None, 't1'), ('B', 'b2'), (None, 't2')]:
+        queue.put_nowait(key, item)
+
+    assert drain(queue) == ['a2', 'b2', 't1', 't2']
+    assert queue.conflated == 2
+
+
+def test_conflate_evicts_keyed_ticks_only():
+    queue = TickQueue(maxsize=3, policy=BackpressurePolicy.CONFLATE)
+
+    queue.put_nowait('A', 'a1')
+    queue.put_nowait(None, 't1')
+    queue.put_nowait(None, 't2')
+    assert queue.put_nowait('B', 'b1')
+    assert queue.put_nowait(None, 't3')
+    assert not queue.put_nowait(None, 't4')
+    assert drain(queue) == ['t1', 't2', 't3']
+    assert queue.dropped == 2
+
+
+def test_conflate_delivers_every_unkeyed_tick():
+    async def main():
+        queue = TickQueue(maxsize=3, policy=BackpressurePolicy.CONFLATE)
+
+        async def produce():
+            for i in range(6):
+                await queue.put(None, f'trade{i}')
+
+        producer = asyncio.create_task(produce())
+        await asyncio.sleep(0)
+        received = [await queue.get() for _ in range(6)]
+        await producer
+
+        return received
+
+    assert asyncio.run(main()) == [f'trade{i}' for i in range(6)]
+
+
+def test_flush_interval_releases_batches():
+    async def main():
+        queue = TickQueue(maxsize=10, policy=BackpressurePolicy.CONFLATE, flush_interval=0.05)
+        queue.put_nowait('A', 'a1')
+        first = await queue.get()
+        queue.put_nowait('A', 'a2')
+        queue.put_nowait('A', 'a3')
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        second = await queue.get()
+
+        return first, second, loop.time() - start
+
+    first, second, waited = asyncio.run(main())
+
+    assert (first, second) == ('a1', 'a3')
+    assert waited >= 0.04
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import websockets
+
+from checkpy import GatewayClient, MarketType, StreamGateway, SubType
+
+
+def serve_ticks():
+    # Stands in for koscom: every open_sise is answered with one transaction frame of its ticker.
+    async def handler(ws):
+        async for message in ws:
+            for request in message.split('|'):
+                request = json.loads(request)
+
+                if request['dtype'] == 'open_sise':
+                    ticker = request['scode'][6:]
+                    await ws.send(json.dumps({'data': {'F16013': ticker, 'F15001': 100, 'F15020': 1, 'F15019': 90000000}}))
+
+    return websockets.serve(handler, '127.0.0.1', 0)
+
+
+def test_subscribe_larger_than_the_default_line_limit_round_trips(tmp_path):
+    tickers = [f'{i:06d}' for i in range(3000)]
+    subscribes = [(MarketType.KOSPI_STOCK, SubType.TRANSACTION, ticker) for ticker in tickers]
+
+    # One request line for all of these would be far over asyncio's 64 KiB readline default.
+    assert len(json.dumps({'op': 'subscribe', 'subscribes': [[str(value) for value in subscribe] for subscribe in subscribes]})) > 2 ** 16
+
+    async def main():
+        async with serve_ticks() as upstream:
+            port = upstream.sockets[0].getsockname()[1]
+            path = str(tmp_path / 'gateway.sock')
+            gateway = StreamGateway('user', 'key', path=path, wss_uri=f'ws://127.0.0.1:{port}', batch_interval=0.01)
+            task = asyncio.create_task(gateway.start())
+            await asyncio.sleep(0.2)
+            client = GatewayClient(subscribes, path=path)
+            received = set()
+
+            async def take():
+                async for msg in client:
+                    received.add(client.msg_code(msg))
+
+                    if len(received) == len(tickers):
+                        break
+
+            await asyncio.wait_for(take(), timeout=30)
+            stats = gateway.stats()
+            task.cancel()
+
+            return received, stats
+
+    received, stats = asyncio.run(main())
+
+    assert received == {f'{MarketType.KOSPI_STOCK}{SubType.TRANSACTION}{ticker}' for ticker in tickers}
+    assert stats['codes'] == len(tickers)
+
+
+def test_client_subscribe_requests_are_split_into_lines(tmp_path):
+    path = str(tmp_path / 'gateway.sock')
+    lines = []
+
+    async def main():
+        async def handle(reader, writer):
+            while True:
+                line = await reader.readline()
+
+                if line == b'':
+                    break
+
+                lines.append(json.loads(line))
+
+        server = await asyncio.start_unix_server(handle, path=path)
+        client = GatewayClient([(MarketType.KOSPI_STOCK, SubType.TRANSACTION, f'{i:06d}') for i in range(2500)], path=path)
+
+        async def consume():
+            async for _ in client:
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.2)
+        client.unsubscribe([(MarketType.KOSPI_STOCK, SubType.TRANSACTION, f'{i:06d}') for i in range(1500)])
+        await asyncio.sleep(0.2)
+        task.cancel()
+        server.close()
+
+    asyncio.run(main())
+
+    assert [(line['op'], len(line['subscribes'])) for line in lines] == [('subscribe', 1000), ('subscribe', 1000), ('subscribe', 500), ('unsubscribe', 1000), ('unsubscribe', 500)]
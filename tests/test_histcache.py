@@ -0,0 +1,103 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from checkpy.histcache import HistCache
+
+missing_segments = HistCache._HistCache__missing_segments
+merge_coverage = HistCache._HistCache__merge_coverage
+
+
+def frame(days):
+    index = pd.DatetimeIndex([pd.Timestamp(day, tz='Asia/Seoul') for day in days], name='TIME')
+
+    return pd.DataFrame({'CLOSE': [float(i) for i in range(len(days))]}, index=index)
+
+
+class Recorder(object):
+    def __init__(self, result):
+        self.calls = []
+        self.result = result
+
+    def __call__(self, payload):
+        self.calls.append((payload['sdate'] if 'sdate' in payload else None, payload['edate']))
+
+        return self.result(payload) if callable(self.result) else self.result
+
+
+@pytest.mark.parametrize('start, end, coverage, expected', [
+    (date(2024, 1, 1), date(2024, 1, 10), [], [(date(2024, 1, 1), date(2024, 1, 10))]),
+    (date(2024, 1, 1), date(2024, 1, 10), [(date(2024, 1, 1), date(2024, 1, 10))], []),
+    (date(2024, 1, 1), date(2024, 1, 10), [(date(2024, 1, 4), date(2024, 1, 6))], [(date(2024, 1, 1), date(2024, 1, 3)), (date(2024, 1, 7), date(2024, 1, 10))]),
+    (date(2024, 1, 5), date(2024, 1, 10), [(date(2023, 12, 1), date(2024, 1, 6))], [(date(2024, 1, 7), date(2024, 1, 10))]),
+    (date(2024, 1, 1), date(2024, 1, 5), [(date(2024, 1, 4), date(2024, 2, 1))], [(date(2024, 1, 1), date(2024, 1, 3))]),
+    (date(2024, 1, 1), date(2024, 1, 10), [(date(2024, 1, 2), date(2024, 1, 3)), (date(2024, 1, 6), date(2024, 1, 7))], [(date(2024, 1, 1), date(2024, 1, 1)), (date(2024, 1, 4), date(2024, 1, 5)), (date(2024, 1, 8), date(2024, 1, 10))]),
+    (date(2024, 1, 1), date(2024, 1, 10), [(date(2023, 1, 1), date(2023, 2, 1)), (date(2024, 3, 1), date(2024, 4, 1))], [(date(2024, 1, 1), date(2024, 1, 10))]),
+])
+def test_missing_segments(start, end, coverage, expected):
+    assert missing_segments(start, end, coverage) == expected
+
+
+@pytest.mark.parametrize('coverage, expected', [
+    ([], []),
+    ([(date(2024, 1, 5), date(2024, 1, 9)), (date(2024, 1, 1), date(2024, 1, 3))], [(date(2024, 1, 1), date(2024, 1, 3)), (date(2024, 1, 5), date(2024, 1, 9))]),
+    ([(date(2024, 1, 1), date(2024, 1, 3)), (date(2024, 1, 4), date(2024, 1, 6))], [(date(2024, 1, 1), date(2024, 1, 6))]),
+    ([(date(2024, 1, 1), date(2024, 1, 10)), (date(2024, 1, 3), date(2024, 1, 5))], [(date(2024, 1, 1), date(2024, 1, 10))]),
+    ([(date(2024, 1, 1), date(2024, 1, 5)), (date(2024, 1, 3), date(2024, 1, 8)), (date(2024, 1, 9), date(2024, 1, 9))], [(date(2024, 1, 1), date(2024, 1, 9))]),
+])
+def test_merge_coverage(coverage, expected):
+    assert merge_coverage(coverage) == expected
+
+
+def test_closed_day_without_rows_is_not_fetched_again(tmp_path):
+    cache = HistCache(str(tmp_path))
+    fetch = Recorder((True, None))
+    payload = {'jcode': '005930', 'edate': '20240101'}
+
+    assert cache.fetch('/stock/m001/tick_date', payload, fetch) is None
+    assert cache.fetch('/stock/m001/tick_date', payload, fetch) is None
+    assert len(fetch.calls) == 1
+
+
+def test_failed_day_is_fetched_again(tmp_path):
+    cache = HistCache(str(tmp_path))
+    fetch = Recorder((False, None))
+    payload = {'jcode': '005930', 'edate': '20240101'}
+
+    cache.fetch('/stock/m001/tick_date', payload, fetch)
+    cache.fetch('/stock/m001/tick_date', payload, fetch)
+
+    assert len(fetch.calls) == 2
+
+
+def test_range_only_fetches_uncovered_days(tmp_path):
+    cache = HistCache(str(tmp_path))
+    fetch = Recorder(lambda payload: (True, frame(pd.date_range(pd.Timestamp(payload['sdate']), pd.Timestamp(payload['edate'])))))
+    end_point = '/stock/m001/hist_info'
+
+    first = cache.fetch(end_point, {'jcode': '005930', 'sdate': '20240105', 'edate': '20240110'}, fetch)
+    second = cache.fetch(end_point, {'jcode': '005930', 'sdate': '20240101', 'edate': '20240112'}, fetch)
+
+    assert fetch.calls == [('20240105', '20240110'), ('20240101', '20240104'), ('20240111', '20240112')]
+    assert len(first) == 6
+    assert len(second) == 12
+    assert second.index.is_monotonic_increasing and not second.index.duplicated().any()
+
+
+def test_raw_output_matches_the_uncached_client(tmp_path):
+    from checkpy import OutputType, RestCheckpy
+
+    class Client(RestCheckpy):
+        def _post(self, end_point, payload):
+            return {'success': True, 'results': [{'F20004_01': '90000000', 'F20008_01': '100', 'F20009_01': '1'}, {'F20004_01': '90000100', 'F20008_01': '101', 'F20009_01': '2'}]}
+
+    cached, uncached = Client('user', 'key', cache_dir=str(tmp_path)), Client('user', 'key')
+
+    try:
+        for _ in range(2):
+            assert cached.get_kospi_stock_tick_data('005930', '20240102', output=OutputType.RAW) == uncached.get_kospi_stock_tick_data('005930', '20240102', output=OutputType.RAW)
+
+    finally:
+        cached.close()
+        uncached.close()
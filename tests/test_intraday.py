@@ -0,0 +1,116 @@
+import pytest
+
+from checkpy import AsyncRestCheckpy, IntradayPoller, OutputType, RestCheckpy
+
+
+class SessionClient(RestCheckpy):
+    def __init__(self):
+        super().__init__('user', 'key')
+        self.rows = []
+
+    def _post(self, end_point, payload):
+        return {'success': True, 'results': list(self.rows)}
+
+
+def tick(tr_time, price):
+    return {'F20004_01': str(tr_time), 'F20008_01': str(price), 'F20009_01': '1'}
+
+
+def bar(intra_time, price):
+    return {'F20044_02': '20240102', 'F20004_02': str(intra_time), 'F20008_02': str(price)}
+
+
+def prices(rows):
+    return [row['INTRA_CLOSE'] for row in rows] if rows is not None else []
+
+
+@pytest.fixture
+def client():
+    client = SessionClient()
+    yield client
+    client.close()
+
+
+def test_only_new_rows_are_returned(client):
+    poller = IntradayPoller(client, 'get_kospi_index_tick_info', output=OutputType.RAW)
+    client.rows = [tick(9000000, 1), tick(9000100, 2)]
+
+    assert prices(poller.poll('001')) == [1, 2]
+    assert poller.poll('001') is None
+
+    client.rows += [tick(9000200, 3), tick(9000300, 4)]
+
+    assert prices(poller.poll('001')) == [3, 4]
+    assert prices(poller.frame('001')) == [1, 2, 3, 4]
+    assert poller.last('001') == (9000300.0,)
+
+
+def test_ticks_sharing_the_last_timestamp_are_neither_lost_nor_repeated(client):
+    poller = IntradayPoller(client, 'get_kospi_index_tick_info', output=OutputType.RAW)
+    client.rows = [tick(9000000, 1), tick(9000100, 2), tick(9000100, 3)]
+
+    assert prices(poller.poll('001')) == [1, 2, 3]
+
+    client.rows += [tick(9000100, 4)]
+
+    assert prices(poller.poll('001')) == [4]
+
+    client.rows += [tick(9000100, 5), tick(9000200, 6), tick(9000200, 7)]
+
+    assert prices(poller.poll('001')) == [5, 6, 7]
+    assert poller.poll('001') is None
+    assert prices(poller.frame('001')) == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_newest_first_responses(client):
+    poller = IntradayPoller(client, 'get_kospi_index_tick_info', output=OutputType.RAW)
+    client.rows = [tick(9000100, 2), tick(9000000, 1)]
+
+    assert prices(poller.poll('001')) == [1, 2]
+
+    client.rows = [tick(9000200, 3), tick(9000100, 2), tick(9000000, 1)]
+
+    assert prices(poller.poll('001')) == [3]
+
+
+def test_codes_are_tracked_separately(client):
+    poller = IntradayPoller(client, 'get_kospi_index_tick_info', output=OutputType.RAW)
+    client.rows = [tick(9000000, 1)]
+    poller.poll('001')
+    client.rows = [tick(9000000, 1), tick(9000100, 2)]
+
+    assert prices(poller.poll('002')) == [1, 2]
+    assert prices(poller.poll('001')) == [2]
+
+    poller.reset('001')
+
+    assert prices(poller.poll('001')) == [1, 2]
+
+
+def test_hold_newest_waits_for_the_bar_to_close(client):
+    poller = IntradayPoller(client, 'get_kospi_stock_kline_data_today_10s', output=OutputType.RAW, hold_newest=True)
+    client.rows = [bar(9000000, 1), bar(9001000, 2)]
+
+    assert prices(poller.poll('005930')) == [1]
+
+    client.rows = [bar(9000000, 1), bar(9001000, 3), bar(9002000, 4)]
+
+    assert prices(poller.poll('005930')) == [3]
+    assert len(poller.frame('005930')) == 2
+
+
+def test_plain_calls_are_not_filtered(client):
+    poller = IntradayPoller(client, 'get_kospi_index_tick_info', output=OutputType.RAW)
+    client.rows = [tick(9000000, 1), tick(9000100, 2)]
+    poller.poll('001')
+
+    assert len(client.get_kospi_index_tick_info('001', output=OutputType.RAW)) == 2
+
+
+def test_async_clients_are_rejected():
+    client = AsyncRestCheckpy('user', 'key')
+
+    with pytest.raises(TypeError):
+        IntradayPoller(client, 'get_kospi_index_tick_info')
+
+    client.close()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from checkpy import RateLimiter, RequestPriority
+
+
+def test_burst_is_free_then_rate_limited():
+    limiter = RateLimiter(rate=20, burst=3)
+    start = time.monotonic()
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert time.monotonic() - start < 0.03
+
+    limiter.acquire()
+    limiter.acquire()
+
+    assert time.monotonic() - start >= 0.08
+
+
+def test_higher_lanes_go_first():
+    limiter = RateLimiter(rate=20, burst=1)
+    limiter.acquire()
+    order = []
+    threads = []
+
+    # Queued while the bucket is empty, in the opposite order of their priority.
+    for priority in [RequestPriority.LOW, RequestPriority.NORMAL, RequestPriority.HIGH]:
+        thread = threading.Thread(target=lambda priority=priority: (limiter.acquire(priority), order.append(priority)))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert order == [RequestPriority.HIGH, RequestPriority.NORMAL, RequestPriority.LOW]
+
+
+def test_lane_is_first_in_first_out():
+    limiter = RateLimiter(rate=50, burst=1)
+    limiter.acquire()
+    order = []
+    threads = []
+
+    for i in range(4):
+        thread = threading.Thread(target=lambda i=i: (limiter.acquire(RequestPriority.NORMAL), order.append(i)))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.005)
+
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert order == [0, 1, 2, 3]
+
+
+def test_shared_state_splits_one_budget(tmp_path):
+    path = str(tmp_path / 'bucket')
+    first, second = RateLimiter(rate=20, burst=2, state_path=path), RateLimiter(rate=20, burst=2, state_path=path)
+    start = time.monotonic()
+
+    first.acquire()
+    second.acquire()
+
+    assert time.monotonic() - start < 0.03
+
+    first.acquire()
+
+    assert time.monotonic() - start >= 0.04
@@ -0,0 +1,18 @@
+from checkpy import TTLCache
+
+
+def test_raw_rows_handed_out_are_copies():
+    cache = TTLCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+
+        return [{'ABBV_CODE': '005930', 'LAST': '100'}]
+
+    first = cache.fetch('/stock/m001/basic_info', {'jcode': '005930'}, fetch)
+    first[0]['LAST'] = 'changed'
+    first.append({})
+
+    assert cache.fetch('/stock/m001/basic_info', {'jcode': '005930'}, fetch) == [{'ABBV_CODE': '005930', 'LAST': '100'}]
+    assert len(calls) == 1
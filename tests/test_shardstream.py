@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from checkpy import MarketType, ReplaySource, ShardedStreamCheckpy, StreamRecorder, SubType
+
+TICKERS = ['005930', '000660', '035720', '051910']
+SUBSCRIBES = [(MarketType.KOSPI_STOCK, SubType.TRANSACTION, ticker) for ticker in TICKERS]
+
+
+def frame(ticker, i):
+    return json.dumps({'data': {'F16013': ticker, 'F15001': 100 + i, 'F15020': 1, 'F15019': 90000000 + i}})
+
+
+def collect(stream, timeout=30):
+    async def main():
+        received = []
+
+        async def take():
+            async for msg in stream:
+                received.append(msg)
+
+        await asyncio.wait_for(take(), timeout=timeout)
+
+        return received
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_finished_replay_ends_the_iteration(tmp_path, processes):
+    path = str(tmp_path / 'ticks.log')
+
+    with StreamRecorder(path) as recorder:
+        for i in range(100):
+            recorder.write(frame(TICKERS[i % len(TICKERS)], i))
+
+    stream = ShardedStreamCheckpy('user', 'key', SUBSCRIBES, shards=1, processes=processes, source=ReplaySource(path))
+    received = collect(stream)
+
+    assert [msg['LAST'] for msg in received] == [100 + i for i in range(100)]
+    assert [(stat['alive'], stat['error'], stat['messages']) for stat in stream.stats()] == [(False, None, 100)]
+
+
+def test_replay_source_is_not_sharded(tmp_path):
+    with pytest.raises(ValueError):
+        ShardedStreamCheckpy('user', 'key', SUBSCRIBES, shards=2, source=ReplaySource(str(tmp_path / 'ticks.log')))
+
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_each_code_is_served_by_its_own_shard_in_order(processes):
+    # Every open_sise is answered with 50 ticks of its ticker, so each connection only sees the codes routed to it.
+    async def handler(ws):
+        async for message in ws:
+            for request in message.split('|'):
+                request = json.loads(request)
+
+                if request['dtype'] == 'open_sise':
+                    for i in range(50):
+                        await ws.send(frame(request['scode'][6:], i))
+
+    async def main():
+        async with websockets.serve(handler, '127.0.0.1', 0) as upstream:
+            port = upstream.sockets[0].getsockname()[1]
+            stream = ShardedStreamCheckpy('user', 'key', SUBSCRIBES, shards=2, processes=processes, wss_uri=f'ws://127.0.0.1:{port}', batch_interval=0.01)
+            received = {}
+
+            async def take():
+                async for msg in stream:
+                    received.setdefault(stream.msg_code(msg), []).append(msg['LAST'])
+
+                    if sum(len(prices) for prices in received.values()) == 50 * len(TICKERS):
+                        break
+
+            await asyncio.wait_for(take(), timeout=30)
+
+            return stream, received
+
+    stream, received = asyncio.run(main())
+
+    assert received == {f'{MarketType.KOSPI_STOCK}{SubType.TRANSACTION}{ticker}': [100 + i for i in range(50)] for ticker in TICKERS}
+    assert sum(stat['codes'] for stat in stream.stats()) == len(TICKERS)
+    assert sorted(stat['messages'] for stat in stream.stats()) == sorted(50 * sum(stream.shard_of(f'{MarketType.KOSPI_STOCK}{SubType.TRANSACTION}{ticker}') == shard for ticker in TICKERS) for shard in range(2))
@@ -0,0 +1,44 @@
+from checkpy import MarketType, StreamCheckpy, SubType
+from checkpy.checkenum import SubscribeStatus
+
+SAMSUNG = (MarketType.KOSPI_STOCK, SubType.TRANSACTION, '005930')
+CODE = f'{MarketType.KOSPI_STOCK}{SubType.TRANSACTION}005930'
+
+
+def sent(stream):
+    # What the sender task would put on the wire next, marking opens as confirmed like it does after sending.
+    pending = stream._StreamCheckpy__take_pending()
+    stream._StreamCheckpy__mark_subscribed([code for code, dtype in pending.items() if dtype == 'open_sise'])
+
+    return pending
+
+
+def test_subscribe_cancels_a_pending_close():
+    stream = StreamCheckpy('user', 'key', [])
+    stream.subscribe([SAMSUNG])
+
+    assert sent(stream) == {CODE: 'open_sise'}
+
+    stream.unsubscribe([SAMSUNG])
+    stream.subscribe([SAMSUNG])
+
+    assert sent(stream) == {}
+    assert stream.subscribes == {CODE: SubscribeStatus.SUBSCRIBED}
+
+
+def test_unsubscribe_cancels_a_pending_open():
+    stream = StreamCheckpy('user', 'key', [])
+    stream.subscribe([SAMSUNG])
+    stream.unsubscribe([SAMSUNG])
+
+    assert sent(stream) == {}
+    assert stream.subscribes == {}
+
+
+def test_unsubscribe_while_the_open_is_in_flight_sends_a_close():
+    stream = StreamCheckpy('user', 'key', [])
+    stream.subscribe([SAMSUNG])
+    stream._StreamCheckpy__take_pending()
+    stream.unsubscribe([SAMSUNG])
+
+    assert sent(stream) == {CODE: 'close_sise'}